@@ -3,6 +3,8 @@
 # Commercial use requires a paid license. See link for details.
 from .core.importing.phicode_importer import install_phicode_importer
 from .core.transpilation.phicode_to_python import transpile_symbols, get_symbol_mappings
+from .core.cache.phicode_cache import pin_module, cache_memory_report
+from .core.cache.phicode_cache_stats import stats, reset_stats
 from .config.version import __version__
 
 try:
@@ -18,6 +20,10 @@ __all__ = [
     "install_phicode_importer",
     "transpile_symbols", 
     "get_symbol_mappings",
+    "pin_module",
+    "cache_memory_report",
+    "stats",
+    "reset_stats",
     "main"
 ]
 
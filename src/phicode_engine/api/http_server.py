@@ -1,14 +1,41 @@
 # Copyright 2025 Baleine Jay
 # Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
 # Commercial use requires a paid license. See link for details.
+import codecs
+import hmac
 import http.server
+import importlib.util
+import os
+import re
 import socketserver
+import sys
 import json
 from .subprocess_handler import PhicodeSubprocessHandler
-from ..config.config import SERVER, ENGINE
+from ..config.config import (SERVER, ENGINE, CACHE_FILE_TYPE, REMOTE_CACHE_FOLDER_NAME, REMOTE_CACHE_TOKEN,
+                             REMOTE_CACHE_OPEN_WRITES, REMOTE_CACHE_MAX_BYTES, STREAM_CHUNK_SIZE, STREAM_SECURITY_OVERLAP)
 from ..core.phicode_logger import logger
+from ..core.cache.phicode_cache_stats import stats
+from ..core.cache.phicode_store import FileStore, get_cache_root
+from ..core.cache.phicode_bytecode import is_valid_header
+from ..core.transpilation.phicode_stream import iter_transpile
 from ..security.phimmuno_validator import is_content_safe, is_security_enabled
 
+_CACHE_PATH = re.compile(r'^/cache/([a-z0-9_.\-]{1,64})/([0-9a-f]{16,64})$')
+_cache_stores = {}
+
+class _UnsafeContent(Exception):
+    pass
+
+class _TruncatedBody(Exception):
+    pass
+
+def _cache_store(cache_tag: str) -> FileStore:
+    store = _cache_stores.get(cache_tag)
+    if store is None:
+        store = _cache_stores[cache_tag] = FileStore(
+            os.path.join(get_cache_root(), REMOTE_CACHE_FOLDER_NAME, cache_tag), CACHE_FILE_TYPE)
+    return store
+
 class PhicodeHTTPServer(http.server.BaseHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         self.handler = PhicodeSubprocessHandler()
@@ -19,14 +46,26 @@ class PhicodeHTTPServer(http.server.BaseHTTPRequestHandler):
             self._handle_execute()
         elif self.path == '/convert':
             self._handle_convert()
+        elif self.path == '/transpile':
+            self._handle_transpile()
+        else:
+            self._send_error(404, f"{SERVER} Endpoint not found")
+
+    def do_PUT(self):
+        if self.path.startswith('/cache/'):
+            self._handle_cache_put()
         else:
             self._send_error(404, f"{SERVER} Endpoint not found")
 
     def do_GET(self):
-        if self.path == '/info':
+        if self.path.startswith('/cache/'):
+            self._handle_cache_get()
+        elif self.path == '/info':
             self._handle_info()
         elif self.path == '/symbols':
             self._handle_symbols()
+        elif self.path == '/stats':
+            self._handle_stats()
         else:
             self._send_error(404, f"{SERVER} Endpoint not found")
 
@@ -48,7 +87,7 @@ class PhicodeHTTPServer(http.server.BaseHTTPRequestHandler):
                 self._send_error(403, "Security threat detected")
                 return
 
-            result = self.handler.convert_code(payload['code'], payload['target'])
+            result = self.handler.convert_code(payload['code'], payload['target'], payload.get('path'))
             self._send_json_response(result)
 
         except json.JSONDecodeError:
@@ -56,10 +95,113 @@ class PhicodeHTTPServer(http.server.BaseHTTPRequestHandler):
         except Exception as e:
             self._send_error(500, f"{SERVER} error: {str(e)}")
 
+    def _read_text(self, content_length: int):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        check = is_security_enabled()
+        tail = ''
+        remaining = content_length
+        while remaining:
+            data = self.rfile.read(min(remaining, STREAM_CHUNK_SIZE))
+            if not data:
+                decoder.decode(b'', final=True)
+                raise _TruncatedBody()
+            remaining -= len(data)
+            text = decoder.decode(data, final=not remaining)
+            if check:
+                window = tail + text
+                if not is_content_safe(window):
+                    raise _UnsafeContent()
+                overlap = max(0, len(window) - STREAM_SECURITY_OVERLAP)
+                line = window.find('\n', overlap)
+                tail = window[line + 1:] if line >= 0 else window[overlap:]
+            yield text
+
+    def _handle_transpile(self):
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self._send_error(400, "Invalid Content-Length")
+            return
+        if content_length <= 0:
+            self._send_error(400, "Empty request body")
+            return
+
+        started = False
+        try:
+            for piece in iter_transpile(self._read_text(content_length)):
+                if not started:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                    self.send_header('Connection', 'close')
+                    self.end_headers()
+                    started = True
+                self.wfile.write(piece.encode('utf-8'))
+        except (_UnsafeContent, _TruncatedBody, UnicodeDecodeError) as e:
+            if isinstance(e, _UnsafeContent):
+                code, message = 403, "Security threat detected"
+            elif isinstance(e, _TruncatedBody):
+                code, message = 400, "Request body ended early"
+            else:
+                code, message = 400, "Invalid UTF-8"
+            if started:
+                logger.warning(f"⚠️ Stream aborted: {message}")
+                self.close_connection = True
+            else:
+                self._send_error(code, message)
+
     def _handle_symbols(self):
         result = self.handler.get_symbol_mappings()
         self._send_json_response(result)
 
+    def _handle_stats(self):
+        self._send_json_response({"success": True, "cache": stats()})
+
+    def _cache_entry(self):
+        match = _CACHE_PATH.match(self.path)
+        if match is None:
+            self._send_error(400, "Expected /cache/<interpreter tag>/<hex digest>")
+            return None
+        if REMOTE_CACHE_TOKEN and not hmac.compare_digest(self.headers.get('Authorization', ''),
+                                                          f"Bearer {REMOTE_CACHE_TOKEN}"):
+            self._send_error(401, "Invalid cache token")
+            return None
+        return match.group(1), match.group(2)
+
+    def _handle_cache_get(self):
+        entry = self._cache_entry()
+        if entry is None:
+            return
+        cache_tag, key = entry
+        data = _cache_store(cache_tag).read(key)
+        if data is None:
+            self._send_error(404, "Cache entry not found")
+            return
+        self._send_bytes(data)
+
+    def _handle_cache_put(self):
+        if not REMOTE_CACHE_TOKEN and not REMOTE_CACHE_OPEN_WRITES:
+            self._send_error(403, "Cache uploads need PHICODE_REMOTE_CACHE_TOKEN")
+            return
+        entry = self._cache_entry()
+        if entry is None:
+            return
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self._send_error(400, "Invalid Content-Length")
+            return
+        if content_length <= 0 or content_length > REMOTE_CACHE_MAX_BYTES:
+            self._send_error(413 if content_length > 0 else 400, "Cache entry empty or too large")
+            return
+        cache_tag, key = entry
+        data = self.rfile.read(content_length)
+        magic = importlib.util.MAGIC_NUMBER if cache_tag == sys.implementation.cache_tag else None
+        if not is_valid_header(data, bytes.fromhex(key[:16]), magic):
+            self._send_error(400, "Cache entry header does not match its digest")
+            return
+        _cache_store(cache_tag).write_batch([(key, data)])
+        self._send_json_response({"success": True})
+
     def _handle_execute(self):
         try:
             content_length = int(self.headers.get('Content-Length', 0))
@@ -101,6 +243,13 @@ class PhicodeHTTPServer(http.server.BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(response_body.encode('utf-8'))
 
+    def _send_bytes(self, data):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
     def _send_error(self, code, message):
         error_data = {"success": False, "error": message}
         response_body = json.dumps(error_data)
@@ -112,13 +261,17 @@ class PhicodeHTTPServer(http.server.BaseHTTPRequestHandler):
 
 def start_server(host: str = "localhost", port: int = 8000):
     try:
-        with socketserver.TCPServer((host, port), PhicodeHTTPServer) as httpd:
+        with socketserver.ThreadingTCPServer((host, port), PhicodeHTTPServer) as httpd:
             logger.info(f"🌐 {SERVER} running on http://{host}:{port}")
             logger.info("📋 Endpoints:")
             logger.info("   POST /execute - Execute φ or Python code")
             logger.info("   POST /convert - Convert Python ↔ φ")
+            logger.info("   POST /transpile - Stream φ source to Python")
             logger.info(f"   GET  /info    - {ENGINE} info")
             logger.info("   GET  /symbols - Symbol mappings")
+            logger.info("   GET  /stats   - Cache telemetry")
+            logger.info("   GET  /cache/<tag>/<digest> - Fetch a compiled module")
+            logger.info("   PUT  /cache/<tag>/<digest> - Upload a compiled module")
 
             if is_security_enabled():
                 logger.info("🛡️  Security validation: ENABLED")
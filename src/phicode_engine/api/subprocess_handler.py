@@ -5,12 +5,10 @@ import sys
 import subprocess
 import os
 import time
+from typing import Optional
 from ..config.config import ENGINE, BADGE, SYMBOL, PYTHON_TO_PHICODE, PHICODE_VERSION
-
-try:
-    import regex as re
-except ImportError:
-    import re
+from ..core.cache.phicode_chunks import transpile_chunked
+from ..core.transpilation.python_to_phicode import python_to_phicode
 
 class PhicodeSubprocessHandler:
     def __init__(self, timeout: int = 30):
@@ -34,14 +32,13 @@ class PhicodeSubprocessHandler:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def convert_code(self, code: str, target: str) -> dict:
+    def convert_code(self, code: str, target: str, path: Optional[str] = None) -> dict:
         try:
             if target == "phicode":
-                converted = self._python_to_phi(code)
-                symbols_used = [sym for sym in PYTHON_TO_PHICODE.values() if sym in converted]
+                converted, symbols_used = python_to_phicode(code)
                 return {"success": True, "converted": converted, "symbols_used": symbols_used, "target": target}
             elif target == "python":
-                converted = self._phi_to_python(code)
+                converted = self._phi_to_python(code, path)
                 return {"success": True, "converted": converted, "target": target}
             else:
                 return {"success": False, "error": f"Invalid target: {target}"}
@@ -52,17 +49,10 @@ class PhicodeSubprocessHandler:
         return {"success": True, "python_to_phicode": PYTHON_TO_PHICODE, "phicode_to_python": self.phicode_to_python, "symbol_count": len(PYTHON_TO_PHICODE)}
 
     def _python_to_phi(self, code: str) -> str:
-        converted = code
-        for python_kw, phi_symbol in sorted(PYTHON_TO_PHICODE.items(), key=lambda x: len(x[0]), reverse=True):
-            pattern = rf'\b{re.escape(python_kw)}\b'
-            converted = re.sub(pattern, phi_symbol, converted)
-        return converted
+        return python_to_phicode(code)[0]
 
-    def _phi_to_python(self, code: str) -> str:
-        converted = code
-        for phi_symbol, python_kw in self.phicode_to_python.items():
-            converted = converted.replace(phi_symbol, python_kw)
-        return converted
+    def _phi_to_python(self, code: str, path: Optional[str] = None) -> str:
+        return transpile_chunked(code, path)
 
     def get_engine_info(self) -> dict:
         try:
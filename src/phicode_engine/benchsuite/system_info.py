@@ -55,10 +55,18 @@ def format_system_report() -> str:
   CPU: {info['cpu_physical']} cores ({info['cpu_logical']} logical)
   Memory: {info['memory_gb']} GB
   Architecture: {info['arch']}
-  Performance Baseline: {baseline:,.0f} ops/sec"""
+  Performance Baseline: {baseline:,.0f} ops/sec
+  Transpiler Cutover: {_transpiler_cutover()}"""
 
     return report
 
+def _transpiler_cutover() -> str:
+    try:
+        from phicode_engine.rust.phirust_calibrate import describe_calibration
+        return describe_calibration()
+    except ImportError:
+        return "unknown"
+
 def get_reproducibility_hash() -> str:
     import hashlib
 
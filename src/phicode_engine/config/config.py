@@ -62,6 +62,21 @@ COMPILE_FOLDER_NAME = f"com{SYMBOL}led"    # comφled
 
 CACHE_PATH = f".{BADGE}cache"  # .(φ)cache
 CACHE_FILE_TYPE = f"{MAIN_FILE_TYPE}ca"  # .φca
+MANIFEST_FOLDER_NAME = "manifest"
+MANIFEST_FILE_TYPE = f"{MAIN_FILE_TYPE}mf"  # .φmf
+PACK_FILE_TYPE = f"{MAIN_FILE_TYPE}pack"  # .φpack
+SHARED_CACHE_NAME = "shared"
+GC_LEDGER_NAME = "ledger"
+GC_LEDGER_FILE_TYPE = f"{MAIN_FILE_TYPE}gc"  # .φgc
+SHARED_FILE_TYPE = f"{MAIN_FILE_TYPE}shm"  # .φshm
+GLOBAL_CACHE_FOLDER_NAME = "phicode"
+GLOBAL_OBJECTS_NAME = "objects"
+GLOBAL_INDEX_NAME = "index"
+GLOBAL_INDEX_FILE_TYPE = f"{MAIN_FILE_TYPE}ix"  # .φix
+FROZEN_INDEX_NAME = "modules"
+REMOTE_CACHE_FOLDER_NAME = "remote"
+SYMBOL_TABLE_NAME = "symbols"
+SYMBOL_TABLE_FILE_TYPE = f"{MAIN_FILE_TYPE}sym"  # .φsym
 
 
 #---  --  ---#
@@ -70,8 +85,44 @@ CACHE_FILE_TYPE = f"{MAIN_FILE_TYPE}ca"  # .φca
 
 # Cache Configuration
 CACHE_MAX_SIZE = int(os.getenv('PHICODE_CACHE_SIZE', 512))
+CACHE_SOURCE_BYTES = int(float(os.getenv('PHICODE_SOURCE_CACHE_MB', 32)) * 1024 * 1024)
+CACHE_PYTHON_BYTES = int(float(os.getenv('PHICODE_PYTHON_CACHE_MB', 32)) * 1024 * 1024)
+CACHE_SPEC_BYTES = int(float(os.getenv('PHICODE_SPEC_CACHE_MB', 4)) * 1024 * 1024)
+CACHE_HINT_BYTES = int(float(os.getenv('PHICODE_HINT_CACHE_MB', 1)) * 1024 * 1024)
+CACHE_CHUNK_BYTES = int(float(os.getenv('PHICODE_CHUNK_CACHE_MB', 16)) * 1024 * 1024)
+CHUNK_CACHE_MAX_ENTRIES = 8192
+CHUNK_MIN_SOURCE = int(os.getenv('PHICODE_CHUNK_MIN_SOURCE', 64 * 1024))  # Smaller sources are transpiled whole
+CHUNK_MIN_SIZE = 2048  # Chunks end at the first anchored top-level line past this many chars
+CHUNK_ANCHOR_MASK = 0x7  # About one top-level line in eight can end a chunk
+CHUNK_TRACKED_PATHS = 256  # Paths whose chunk layout is kept to re-split only the edited region
+CACHE_WINDOW_PERCENT = 1  # W-TinyLFU admission window share of each layer
+CACHE_PROTECTED_PERCENT = 80  # Share of the main region reserved for re-accessed entries
+CACHE_PINNED_MODULES = [p for p in os.getenv('PHICODE_PINNED_MODULES', '').split(os.pathsep) if p]
 CACHE_MMAP_THRESHOLD = int(os.getenv('PHICODE_MMAP_THRESHOLD', 8 * 1024))
 CACHE_BATCH_SIZE = int(os.getenv('PHICODE_BATCH_SIZE', 5))
+CACHE_FSYNC_MODE = os.getenv('PHICODE_FSYNC', 'batch').lower()  # none | batch | file | exit
+CACHE_WRITER_LINGER = float(os.getenv('PHICODE_WRITER_LINGER_MS', 20)) / 1000  # Wait for more writes before flushing a short batch
+CACHE_WRITER_DRAIN_TIMEOUT = float(os.getenv('PHICODE_WRITER_DRAIN_TIMEOUT', 5.0))
+CACHE_BACKEND = os.getenv('PHICODE_CACHE_BACKEND', 'pack').lower()  # pack | files
+PACK_COMPACT_MIN_BYTES = int(os.getenv('PHICODE_PACK_COMPACT_MIN', 4 * 1024 * 1024))
+MANIFEST_ENABLED = os.getenv('PHICODE_MANIFEST', 'true').lower() == 'true'
+CACHE_DISK_LIMIT = int(float(os.getenv('PHICODE_CACHE_DISK_MB', 256)) * 1024 * 1024)  # 0 disables automatic GC
+CACHE_GC_TARGET_PERCENT = 80  # GC evicts down to this share of the disk limit
+SHARED_CACHE_ENABLED = os.getenv('PHICODE_SHARED_CACHE', 'false').lower() == 'true'
+SHARED_CACHE_BYTES = int(float(os.getenv('PHICODE_SHARED_CACHE_MB', 64)) * 1024 * 1024)
+CACHE_COMPRESSION = os.getenv('PHICODE_CACHE_COMPRESSION', 'none').lower()  # none | auto | zlib | lzma | zstd
+CACHE_COMPRESS_THRESHOLD = int(os.getenv('PHICODE_COMPRESS_THRESHOLD', 16 * 1024))  # Only payloads at least this large are compressed
+FROZEN_MODE = os.getenv('PHICODE_FROZEN', 'false').lower() == 'true'  # Load only prebuilt bytecode, never touch sources
+REMOTE_CACHE_URL = os.getenv('PHICODE_REMOTE_CACHE', '')  # http(s)://host:port of an APHI server, or a directory
+REMOTE_CACHE_TIMEOUT = float(os.getenv('PHICODE_REMOTE_CACHE_TIMEOUT_MS', 500)) / 1000
+REMOTE_CACHE_TOKEN = os.getenv('PHICODE_REMOTE_CACHE_TOKEN', '')
+REMOTE_CACHE_OPEN_WRITES = os.getenv('PHICODE_REMOTE_CACHE_OPEN_WRITES', 'false').lower() == 'true'  # Accept PUT without a token
+REMOTE_CACHE_RETRY_AFTER = 60.0  # Seconds to compile locally after a remote fetch or upload fails
+REMOTE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Largest entry the APHI cache endpoint accepts
+GLOBAL_CACHE_ENABLED = os.getenv('PHICODE_GLOBAL_CACHE', 'false').lower() == 'true'
+GLOBAL_CACHE_DIR = os.getenv('PHICODE_GLOBAL_CACHE_DIR', '')  # Defaults to $XDG_CACHE_HOME/phicode
+NEGATIVE_CACHE_MAX_ENTRIES = 4096  # Finder misses remembered per base path before the table is reset
+MANIFEST_RACY_WINDOW = 2.0  # Sources modified this recently (seconds) may still change within the same mtime tick
 
 # Buffer Sizes
 POSIX_BUFFER_SIZE = 128 * 1024
@@ -84,6 +135,8 @@ RETRY_BASE_DELAY = 0.01
 
 # Performance Thresholds
 STARTUP_WARNING_MS = 25
+TRANSLATE_SYMBOL_DENSITY = 0.25  # Extra UTF-8 bytes per char above which str.translate beats the trie split
+TRANSLATE_SAMPLE_SIZE = 4096
 
 # Validation Configuration
 VALIDATION_ENABLED = os.getenv('PHICODE_VALIDATION', 'true').lower() == 'true'
@@ -97,7 +150,21 @@ INTERPRETER_PYTHON_PATH = os.getenv('PHITON_PATH')  # Custom Python for C extens
 INTERPRETER_PYPY_PATH = os.getenv('PHIPY_PATH', 'pypy3')  # Custom PyPy for pure Python
 
 # Rust Transpiler Configuration
-RUST_SIZE_THRESHOLD = 300000  # From here Rust outperforms Python consistently
+RUST_SIZE_THRESHOLD = 300000  # Default cutover; phicode --calibrate fits it per host
+RUST_WORKER_ENABLED = os.getenv('PHICODE_RUST_WORKER', 'true').lower() == 'true'  # Persistent --serve co-process
+RUST_WORKER_THRESHOLD = int(os.getenv('PHICODE_RUST_WORKER_THRESHOLD', 32 * 1024))  # Cutover while the worker runs
+RUST_WORKER_TIMEOUT = 5.0  # Seconds per source in a round trip
+RUST_WORKER_PROBE_TIMEOUT = 0.2  # Seconds for the --serve handshake; binaries that miss it are spawned per file
+RUST_WORKER_MAX_RESTARTS = 3
+CALIBRATION_SIZES = tuple(2048 << i for i in range(11))  # 2K .. 2M characters swept by --calibrate
+CALIBRATION_REPEATS = 3
+
+# Parallel Transpiler Configuration
+TRANSPILE_WORKERS = int(os.getenv('PHICODE_TRANSPILE_WORKERS', 0))  # 0 disables the process pool, -1 uses every core
+PARALLEL_TRANSPILE_THRESHOLD = int(os.getenv('PHICODE_PARALLEL_THRESHOLD', 256 * 1024))  # Default; phicode --calibrate fits it per host
+PARALLEL_CHUNKS_PER_WORKER = 2
+STREAM_CHUNK_SIZE = int(os.getenv('PHICODE_STREAM_CHUNK', 64 * 1024))  # Characters read per step by transpile_stream
+STREAM_SECURITY_OVERLAP = 4096  # Trailing characters of each streamed piece re-checked with the next one
 
 #---  --  ---#
 ## LISTINGS ##
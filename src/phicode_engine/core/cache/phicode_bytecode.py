@@ -2,12 +2,24 @@
 # Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
 # Commercial use requires a paid license. See link for details.
 import importlib.util
+import lzma
 import marshal
-import os
 import hashlib
 import sys
+import time
+import zlib
+from functools import lru_cache
+from types import CodeType
+from typing import Optional
 from ..phicode_logger import logger
-from ...config.config import CACHE_BATCH_SIZE, CACHE_PATH, CACHE_FILE_TYPE, COMPILE_FOLDER_NAME
+from .phicode_store import open_store
+from .phicode_cache_writer import _writer
+from .phicode_shared import get_shared_cache
+from .phicode_global_store import get_global_store
+from .phicode_remote import get_remote_cache
+from .phicode_frozen import FrozenCacheError
+from .phicode_cache_stats import _stats, INVALIDATIONS, INTEGRITY_FAILURES
+from ...config.config import CACHE_FILE_TYPE, COMPILE_FOLDER_NAME, CACHE_COMPRESSION, CACHE_COMPRESS_THRESHOLD
 
 try:
     import xxhash
@@ -15,122 +27,256 @@ try:
 except ImportError:
     _HAS_XXHASH = False
 
-_pending_cache_writes = []
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
 
-def _flush_batch_writes():
-    global _pending_cache_writes
-    if not _pending_cache_writes:
-        return
+# Header v2: magic | flags (bit 0 hash-based, bit 1 xxh3 checksum, bits 2-3 codec, byte 1 version) | source hash | payload checksum
+_HEADER_VERSION = 2
+_HEADER_SIZE = 24
+_FLAG_HASH_BASED = 0x01
+_FLAG_XXH3 = 0x02
+_CODEC_SHIFT = 2
+_CODEC_MASK = 0x03
 
-    written_files = []
-    try:
-        for pyc_path, data in _pending_cache_writes:
-            tmp_path = pyc_path + '.tmp'
-            with open(tmp_path, 'wb', buffering=64*1024) as f:
-                f.write(data)
-                f.flush()
-                written_files.append((tmp_path, pyc_path))
-
-        if written_files:
-            sync_file = written_files[0][0]
-            try:
-                with open(sync_file, 'r+b') as f:
-                    os.fsync(f.fileno())
-            except OSError as e:
-                logger.warning(f"Sync failed for {sync_file}: {e}")
+CODECS = {1: ('zlib', zlib.compress, zlib.decompress), 2: ('lzma', lzma.compress, lzma.decompress)}
+if _zstd is not None:
+    CODECS[3] = ('zstd', _zstd.compress, _zstd.decompress)
+_CODEC_IDS = {name: codec_id for codec_id, (name, _, _) in CODECS.items()}
 
-        for tmp_path, pyc_path in written_files:
-            os.replace(tmp_path, pyc_path)
+def _select_codec(mode: str) -> int:
+    if mode == 'auto':
+        return 3 if 3 in CODECS else 1
+    if mode in ('none', ''):
+        return 0
+    if mode not in _CODEC_IDS:
+        logger.warning(f"Compression codec '{mode}' unavailable, storing bytecode uncompressed")
+        return 0
+    return _CODEC_IDS[mode]
 
-        _pending_cache_writes.clear()
+_codec = _select_codec(CACHE_COMPRESSION)
 
-    except OSError as e:
-        logger.warning(f"Batch cache write failed: {e}")
-        for tmp_path, _ in written_files:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
-        _pending_cache_writes.clear()
+def _payload_checksum(payload, use_xxh3: bool) -> bytes:
+    if use_xxh3:
+        return xxhash.xxh3_64_intdigest(payload).to_bytes(8, 'little')
+    return zlib.crc32(payload).to_bytes(8, 'little')
+
+def _encode_entry(code, source_hash: bytes) -> bytearray:
+    return _encode_payload(marshal.dumps(code), source_hash)
+
+def _encode_payload(payload: bytes, source_hash: bytes, codec: Optional[int] = None,
+                    threshold: int = CACHE_COMPRESS_THRESHOLD) -> bytearray:
+    codec = _codec if codec is None else codec
+    flags = _FLAG_HASH_BASED | (_FLAG_XXH3 if _HAS_XXHASH else 0) | (_HEADER_VERSION << 8)
+    if codec and len(payload) >= threshold:
+        compressed = CODECS[codec][1](payload)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= codec << _CODEC_SHIFT
+    data = bytearray()
+    data += importlib.util.MAGIC_NUMBER
+    data += flags.to_bytes(4, 'little')
+    data += source_hash
+    data += _payload_checksum(payload, _HAS_XXHASH)
+    data += payload
+    return data
+
+def is_valid_header(entry, source_hash: bytes, magic: Optional[bytes] = None) -> bool:
+    if len(entry) < _HEADER_SIZE:
+        return False
+    flags = int.from_bytes(entry[4:8], 'little')
+    magic_ok = entry[:4] == magic if magic is not None else entry[2:4] == b'\r\n'
+    return (magic_ok and (flags >> 8) & 0xFF == _HEADER_VERSION and bool(flags & _FLAG_HASH_BASED) and
+            entry[8:16] == source_hash)
+
+def _decode_entry(entry, source_hash: bytes):
+    if len(entry) < _HEADER_SIZE:
+        return None
+    header = bytes(entry[:_HEADER_SIZE])
+    if header[:4] != importlib.util.MAGIC_NUMBER or header[8:16] != source_hash:
+        return None
+    flags = int.from_bytes(header[4:8], 'little')
+    if (flags >> 8) & 0xFF != _HEADER_VERSION or not flags & _FLAG_HASH_BASED:
+        return None
+    use_xxh3 = bool(flags & _FLAG_XXH3)
+    if use_xxh3 and not _HAS_XXHASH:
+        return None
+
+    codec = (flags >> _CODEC_SHIFT) & _CODEC_MASK
+    if codec and codec not in CODECS:
+        return None
+
+    payload = entry[_HEADER_SIZE:]
+    if _payload_checksum(payload, use_xxh3) != header[16:24]:
+        raise ValueError("payload checksum mismatch")
+    if codec:
+        try:
+            payload = CODECS[codec][2](payload)
+        except Exception as e:
+            raise ValueError(f"{CODECS[codec][0]} decompression failed: {e}") from e
+    return marshal.loads(payload)
+
+def _relocate(code, filename: str):
+    if code.co_filename == filename:
+        return code
+    consts = tuple(_relocate(const, filename) if isinstance(const, CodeType) else const for const in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
+
+def _publish_global(key: str, path: str, digest: bytes, data, exists: bool = False):
+    global_store = get_global_store()
+    if global_store is not None:
+        global_store.publish(key, path, global_store.content_key(digest), data, exists)
+
+def _publish_remote(digest: bytes, data):
+    remote = get_remote_cache()
+    if remote is not None:
+        _writer.submit(remote, digest.hex(), data)
+
+def _flush_batch_writes():
+    _writer.drain()
+
+def _queue_cache_write(store, key: str, data):
+    _writer.submit(store, key, data)
 
 class BytecodeManager:
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _fast_hash_path(path: str) -> str:
         path_bytes = path.encode('utf-8')
         return (xxhash.xxh64(path_bytes).hexdigest()[:16] if _HAS_XXHASH
                 else hashlib.md5(path_bytes).hexdigest()[:16])
 
     @staticmethod
-    def _get_pyc_path(path: str) -> str:
-        safe_name = BytecodeManager._fast_hash_path(path)
+    def _get_store():
         impl_name = sys.implementation.name
         version = f"{sys.version_info.major}{sys.version_info.minor}"
-        cache_dir = os.path.join(os.getcwd(), CACHE_PATH, f'{COMPILE_FOLDER_NAME}_{impl_name}_{version}')
-        os.makedirs(cache_dir, exist_ok=True)
-        return os.path.join(cache_dir, f"{safe_name}" + CACHE_FILE_TYPE)
+        return open_store(f'{COMPILE_FOLDER_NAME}_{impl_name}_{version}', CACHE_FILE_TYPE)
 
     @staticmethod
-    def _is_pyc_valid(pyc_path: str, source_hash: bytes) -> bool:
-        if not os.path.exists(pyc_path):
-            return False
+    def _queue_pyc_write(store, key: str, code, source_hash: bytes, path: str):
         try:
-            with open(pyc_path, 'rb', buffering=32*1024) as f:
-                header = f.read(16)
-                if header[:4] != importlib.util.MAGIC_NUMBER:
-                    return False
-                flags = int.from_bytes(header[4:8], 'little')
-                return header[8:16] == source_hash if flags & 0x01 else False
-        except OSError:
-            return False
+            data = _encode_entry(code, source_hash)
+            _queue_cache_write(store, key, data)
+            store.sources[key] = path
+            return data
+        except Exception as e:
+            logger.warning(f"Failed to queue bytecode cache: {e}")
+            return None
 
     @staticmethod
-    def _load_pyc(pyc_path: str):
-        with open(pyc_path, 'rb', buffering=32*1024) as f:
-            f.read(16)
-            return marshal.load(f)
+    def _load_content(layer: str, content_store, content_key: str, source_hash: bytes, path: str):
+        started = time.perf_counter_ns()
+        entry = content_store.read(content_key)
+        if entry is None:
+            _stats.miss(layer, elapsed_ns=time.perf_counter_ns() - started)
+            return None
+        try:
+            code = _decode_entry(entry, source_hash)
+        except (EOFError, ValueError, TypeError) as e:
+            _stats.add(layer, INTEGRITY_FAILURES)
+            logger.debug(f"{layer.capitalize()} bytecode entry for {path} unreadable: {e}")
+            code = None
+        if code is None:
+            _stats.miss(layer, len(entry), time.perf_counter_ns() - started)
+            return None
+        _stats.hit(layer, len(entry), time.perf_counter_ns() - started)
+        return _relocate(code, path)
 
-    @staticmethod
-    def _queue_pyc_write(pyc_path: str, code, source_hash: bytes):
-        global _pending_cache_writes
+    @classmethod
+    def load_cached(cls, path: str, digest: bytes):
+        store = cls._get_store()
+        key = cls._fast_hash_path(path)
+        source_hash = digest[:8]
 
-        try:
-            data = bytearray()
-            data += importlib.util.MAGIC_NUMBER
-            data += (0x01).to_bytes(4, 'little')
-            data += source_hash
-            data += marshal.dumps(code)
+        started = time.perf_counter_ns()
+        shared = get_shared_cache()
+        shared_key = key + source_hash.hex()
+        if shared is not None:
+            code = shared.get_code(shared_key)
+            if code is not None:
+                return code
 
-            _pending_cache_writes.append((pyc_path, data))
+        entry = store.read(key)
+        if entry is not None:
+            try:
+                code = _decode_entry(entry, source_hash)
+                if code is not None:
+                    store.sources[key] = path
+                    if shared is not None:
+                        shared.put_code(shared_key, code)
+                    _stats.hit('bytecode', len(entry), time.perf_counter_ns() - started)
+                    return code
+                _stats.add('bytecode', INVALIDATIONS)
+            except (EOFError, ValueError, TypeError) as e:
+                _stats.add('bytecode', INTEGRITY_FAILURES)
+                logger.warning(f"Cache integrity check failed for {path}, recompiling: {e}")
+        _stats.miss('bytecode', len(entry) if entry is not None else 0, time.perf_counter_ns() - started)
 
-            if len(_pending_cache_writes) >= CACHE_BATCH_SIZE:
-                _flush_batch_writes()
+        global_store = get_global_store()
+        if global_store is not None:
+            code = cls._load_content('global', global_store, global_store.content_key(digest), source_hash, path)
+            if code is not None:
+                data = cls._queue_pyc_write(store, key, code, source_hash, path)
+                if data is not None:
+                    _publish_global(key, path, digest, data, exists=True)
+                if shared is not None:
+                    shared.put_code(shared_key, code)
+                return code
 
-        except Exception as e:
-            logger.warning(f"Failed to queue bytecode cache: {e}")
+        remote = get_remote_cache()
+        if remote is not None:
+            code = cls._load_content('remote', remote, digest.hex(), source_hash, path)
+            if code is not None:
+                data = cls._queue_pyc_write(store, key, code, source_hash, path)
+                if data is not None:
+                    _publish_global(key, path, digest, data)
+                if shared is not None:
+                    shared.put_code(shared_key, code)
+                return code
+        return None
 
     @classmethod
-    def compile_and_cache(cls, python_source: str, path: str):
-        pyc_path = cls._get_pyc_path(path)
-        source_hash = hashlib.sha256(python_source.encode()).digest()[:8]
+    def load_frozen(cls, path: str, digest: bytes, key: str):
+        entry = cls._get_store().read(key)
+        try:
+            code = _decode_entry(entry, digest[:8]) if entry is not None else None
+        except (EOFError, ValueError, TypeError) as e:
+            raise FrozenCacheError(f"Prebuilt bytecode for {path} is corrupt: {e}") from e
+        if code is None:
+            raise FrozenCacheError(f"No prebuilt bytecode for {path}; rebuild the cache with 'phicode --compile-all'")
+        _stats.hit('bytecode', len(entry))
+        return code
 
-        if cls._is_pyc_valid(pyc_path, source_hash):
-            try:
-                from .phicode_cache import _cache
-                if _cache._verify_cache_integrity(pyc_path):
-                    return cls._load_pyc(pyc_path)
-                else:
-                    logger.warning(f"Cache integrity check failed for {pyc_path}, recompiling")
-            except Exception as e:
-                logger.warning(f"Failed to load cached bytecode, recompiling: {e}")
+    @classmethod
+    def compile_and_cache(cls, python_source: str, path: str, digest: bytes):
+        code = cls.load_cached(path, digest)
+        if code is not None:
+            return code
+        return cls.compile_and_store(python_source, path, digest)
 
+    @classmethod
+    def compile_and_store(cls, python_source: str, path: str, digest: bytes):
+        store = cls._get_store()
+        key = cls._fast_hash_path(path)
+        source_hash = digest[:8]
         try:
             import ast
             tree = ast.parse(python_source, filename=path)
             code = compile(tree, filename=path, mode='exec', optimize=2, dont_inherit=True)
-            cls._queue_pyc_write(pyc_path, code, source_hash)
+            data = cls._queue_pyc_write(store, key, code, source_hash, path)
+            if data is not None:
+                _publish_global(key, path, digest, data)
+                _publish_remote(digest, data)
+            shared = get_shared_cache()
+            if shared is not None:
+                shared.put_code(key + source_hash.hex(), code)
             return code
         except Exception as compile_error:
             logger.error(f"Compilation failed for {path}: {compile_error}")
             simple_code = compile(python_source, path, 'exec')
             logger.info(f"Executed {path} without cache optimization")
-            return simple_code
\ No newline at end of file
+            return simple_code
@@ -3,81 +3,169 @@
 # Commercial use requires a paid license. See link for details.
 import os
 import sys
+import time
+from concurrent.futures import Future
 from threading import RLock
-from collections import OrderedDict
-from typing import Optional, Tuple
-from ..transpilation.phicode_to_python import transpile_symbols
-from ...config.config import CACHE_PATH, CACHE_MAX_SIZE, IMPORT_ANALYSIS_ENABLED
+from typing import Dict, Optional, Tuple
+from ...config.config import (CACHE_PATH, IMPORT_ANALYSIS_ENABLED, CACHE_SOURCE_BYTES, CACHE_PYTHON_BYTES,
+                              CACHE_SPEC_BYTES, CACHE_HINT_BYTES, CACHE_PINNED_MODULES)
 from .phicode_cache_ops import CacheOperations
 from .phicode_cache_validation import CacheValidation
+from .phicode_cache_policy import BudgetedCache
+from .phicode_cache_stats import _stats
+from .phicode_shared import get_shared_cache
+from .phicode_load_context import ModuleLoadContext, content_digest
+from .phicode_chunks import _chunks, transpile_chunked
 
 class PhicodeCache(CacheOperations, CacheValidation):
     def __init__(self, cache_dir=CACHE_PATH):
         super().__init__()
         self.cache_dir = os.path.abspath(cache_dir)
-        os.makedirs(self.cache_dir, exist_ok=True)
-        self.source_cache = OrderedDict()
-        self.python_cache = OrderedDict()
-        self.spec_cache = OrderedDict()
+        self.source_cache = BudgetedCache('source', CACHE_SOURCE_BYTES)
+        self.python_cache = BudgetedCache('python', CACHE_PYTHON_BYTES)
+        self.spec_cache = BudgetedCache('spec', CACHE_SPEC_BYTES)
         self._lock = RLock()
+        self._inflight: Dict[Tuple[str, object], Future] = {}
         self._canon_cache = {}
-        self.interpreter_hints = OrderedDict()
+        self.interpreter_hints = BudgetedCache('interpreter_hint', CACHE_HINT_BYTES)
+        self._pinned_paths = set()
+        for path in CACHE_PINNED_MODULES:
+            self.pin(path)
 
-    def _evict_if_needed(self, cache):
-        if len(cache) > CACHE_MAX_SIZE:
-            evict_count = min(CACHE_MAX_SIZE // 4, len(cache) - CACHE_MAX_SIZE + 64)
-            for _ in range(evict_count):
-                cache.popitem(last=False)
+    def _layers(self):
+        return (self.source_cache, self.python_cache, self.spec_cache, self.interpreter_hints, _chunks.layer)
 
-    def get_source(self, path: str) -> Optional[str]:
+    def _is_pinned(self, path: str) -> bool:
+        return bool(self._pinned_paths) and self._canonicalize_path(path) in self._pinned_paths
+
+    def pin(self, path: str):
+        canon_path = self._canonicalize_path(path)
         with self._lock:
-            if path in self.source_cache:
-                self.source_cache.move_to_end(path)
-                return self.source_cache[path]
+            self._pinned_paths.add(canon_path)
+            self.source_cache.pin(canon_path)
 
-            source = self._read_file(path)
-            if source is not None:
-                self.source_cache[path] = source
-                self._evict_if_needed(self.source_cache)
-            return source
+    def unpin(self, path: str):
+        canon_path = self._canonicalize_path(path)
+        with self._lock:
+            self._pinned_paths.discard(canon_path)
+            self.source_cache.unpin(canon_path)
 
-    def get_python_source(self, path: str, phicode_source: str) -> str:
-        cache_key = self._fast_hash(phicode_source)
+    def memory_report(self, top: int = 5) -> Dict[str, dict]:
+        return {layer.name: layer.memory_report(top) for layer in self._layers()}
 
+    def _single_flight(self, layer: str, key, lookup, compute):
+        flight_key = (layer, key)
         with self._lock:
-            if cache_key in self.python_cache:
-                self.python_cache.move_to_end(cache_key)
-                return self.python_cache[cache_key]
-
-            python_source = transpile_symbols(phicode_source)
-            if IMPORT_ANALYSIS_ENABLED:
-                optimal_interpreter = self._quick_interpreter_check(python_source)
-                self.interpreter_hints[cache_key] = optimal_interpreter
-                self._evict_if_needed(self.interpreter_hints)
-            self.python_cache[cache_key] = python_source
-            self._evict_if_needed(self.python_cache)
+            value = lookup()
+            if value is not None:
+                _stats.hit(layer)
+                return value
+            flight = self._inflight.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[flight_key] = Future()
+
+        if not leader:
+            value = flight.result()
+            _stats.hit(layer)
+            return value
+
+        try:
+            value = compute()
+            flight.set_result(value)
+            return value
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[flight_key]
+
+    def load_context(self, path: str) -> Optional[ModuleLoadContext]:
+        cached = self.source_cache.get(path)
+        if cached is not None:
+            _stats.hit('source')
+            return ModuleLoadContext(path, *cached)
+        cached = self._single_flight('source', path, lambda: self.source_cache.get(path),
+                                     lambda: self._load_source(path))
+        return ModuleLoadContext(path, *cached) if cached is not None else None
+
+    def _load_source(self, path: str) -> Optional[Tuple[bytes, bytes]]:
+        started = time.perf_counter_ns()
+        raw = self._read_file(path)
+        if raw is None:
+            _stats.miss('source', elapsed_ns=time.perf_counter_ns() - started)
+            return None
+        cached = (raw, content_digest(raw))
+        self.source_cache.put(path, cached, pinned=self._is_pinned(path))
+        _stats.miss('source', len(raw), time.perf_counter_ns() - started)
+        return cached
+
+    def get_python_source(self, path: str, phicode_source: str) -> str:
+        cache_key = content_digest(phicode_source.encode('utf-8')).hex()
+        return self._python_source(path, cache_key, lambda: phicode_source)
+
+    def get_module_python_source(self, context: ModuleLoadContext) -> str:
+        return self._python_source(context.path, context.key, lambda: context.source)
+
+    def _python_source(self, path: str, cache_key: str, read_source) -> str:
+        python_source = self.python_cache.get(cache_key)
+        if python_source is not None:
+            _stats.hit('python')
             return python_source
+        return self._single_flight('python', cache_key, lambda: self.python_cache.get(cache_key),
+                                   lambda: self._transpile(path, read_source, cache_key))
+
+    def _transpile(self, path: str, read_source, cache_key: str) -> str:
+        started = time.perf_counter_ns()
+        pinned = self._is_pinned(path)
+        shared = get_shared_cache()
+        python_source = shared.get_text(cache_key) if shared is not None else None
+        if python_source is None:
+            python_source = transpile_chunked(read_source(), path)
+            if shared is not None:
+                shared.put_text(cache_key, python_source)
+        if IMPORT_ANALYSIS_ENABLED:
+            optimal_interpreter = self._quick_interpreter_check(python_source)
+            self.interpreter_hints.put(cache_key, optimal_interpreter, pinned=pinned)
+        if shared is None or pinned:
+            self.python_cache.put(cache_key, python_source, pinned=pinned)
+        _stats.miss('python', elapsed_ns=time.perf_counter_ns() - started)
+        return python_source
 
     def get_spec(self, key: Tuple[str, str]) -> Optional[object]:
-        with self._lock:
-            if key in self.spec_cache:
-                self.spec_cache.move_to_end(key)
-                return self.spec_cache[key]
-            return None
+        spec = self.spec_cache.get(key)
+        if spec is None:
+            _stats.miss('spec')
+        else:
+            _stats.hit('spec')
+        return spec
 
     def set_spec(self, key: Tuple[str, str], value: object):
-        with self._lock:
-            self.spec_cache[key] = value
-            self._evict_if_needed(self.spec_cache)
+        if value is None:
+            self.spec_cache.pop(key)
+        else:
+            self.spec_cache.put(key, value)
 
     def get_interpreter_hint(self, path: str, phicode_source: str) -> str:
+        return self._interpreter_hint(content_digest(phicode_source.encode('utf-8')).hex())
+
+    def get_module_interpreter_hint(self, context: ModuleLoadContext) -> str:
+        return self._interpreter_hint(context.key)
+
+    def _interpreter_hint(self, cache_key: str) -> str:
         if not IMPORT_ANALYSIS_ENABLED:
             return sys.executable
-        cache_key = self._fast_hash(phicode_source)
-        with self._lock:
-            if cache_key in self.interpreter_hints:
-                self.interpreter_hints.move_to_end(cache_key)
-                return self.interpreter_hints[cache_key]
-        return sys.executable
+        hint = self.interpreter_hints.get(cache_key)
+        if hint is None:
+            _stats.miss('interpreter_hint')
+            return sys.executable
+        _stats.hit('interpreter_hint')
+        return hint
+
+_cache = PhicodeCache()
+def pin_module(path: str):
+    _cache.pin(path)
 
-_cache = PhicodeCache()
\ No newline at end of file
+def cache_memory_report(top: int = 5) -> Dict[str, dict]:
+    return _cache.memory_report(top)
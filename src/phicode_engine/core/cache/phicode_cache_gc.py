@@ -0,0 +1,228 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import marshal
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from ..phicode_logger import logger
+from .phicode_manifest import ModuleManifest
+from .phicode_pack import PackStore, _lock_fd, _unlock_fd
+from .phicode_store import FileStore, get_cache_root, _stores
+from .phicode_global_store import get_global_store
+from ...config.config import (CACHE_FILE_TYPE, MANIFEST_FILE_TYPE, MANIFEST_FOLDER_NAME, PACK_FILE_TYPE,
+                              REMOTE_CACHE_FOLDER_NAME, SHARED_CACHE_NAME, SHARED_FILE_TYPE, GC_LEDGER_NAME, GC_LEDGER_FILE_TYPE, CACHE_DISK_LIMIT, CACHE_GC_TARGET_PERCENT)
+
+_LEDGER_FORMAT = 2
+_TEMP_MAX_AGE = 3600
+
+def _store_id(store, root: str) -> str:
+    return os.path.relpath(getattr(store, 'pack_path', None) or store.directory, root).replace(os.sep, '/')
+
+def _scan_sorted(directory: str) -> List[os.DirEntry]:
+    try:
+        return sorted(os.scandir(directory), key=lambda e: e.name)
+    except OSError:
+        return []
+
+def _discover_stores(root: str) -> List[Tuple[str, object]]:
+    stores = []
+    for entry in _scan_sorted(root):
+        if entry.name in (SHARED_CACHE_NAME, SHARED_CACHE_NAME + SHARED_FILE_TYPE):
+            continue
+        if entry.name.endswith(PACK_FILE_TYPE) and entry.is_file():
+            stores.append((entry.name, PackStore(entry.path)))
+        elif entry.is_dir() and entry.name == REMOTE_CACHE_FOLDER_NAME:
+            stores.extend((f"{entry.name}/{tag.name}", FileStore(tag.path, CACHE_FILE_TYPE))
+                          for tag in _scan_sorted(entry.path) if tag.is_dir())
+        elif entry.is_dir():
+            file_type = MANIFEST_FILE_TYPE if entry.name == MANIFEST_FOLDER_NAME else CACHE_FILE_TYPE
+            stores.append((entry.name, FileStore(entry.path, file_type)))
+    return stores
+
+def _measure(stores: List[Tuple[str, object]]) -> int:
+    return sum(store.disk_size() for _, store in stores)
+
+@contextmanager
+def _open_ledger(root: str):
+    fd = os.open(os.path.join(root, GC_LEDGER_NAME + GC_LEDGER_FILE_TYPE),
+                 os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        _lock_fd(fd)
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            raw = b''.join(iter(lambda: os.read(fd, 1 << 20), b''))
+            try:
+                ledger = marshal.loads(raw)
+                if ledger.get('format') != _LEDGER_FORMAT:
+                    raise ValueError("ledger format")
+            except (EOFError, ValueError, TypeError, AttributeError):
+                ledger = {'format': _LEDGER_FORMAT, 'size': None, 'access': {}, 'sources': {}}
+
+            yield ledger
+
+            data = marshal.dumps(ledger)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, data)
+            os.ftruncate(fd, len(data))
+        finally:
+            _unlock_fd(fd)
+    finally:
+        os.close(fd)
+
+def update_ledger():
+    root = get_cache_root()
+    touched = [store for store in list(_stores.values()) if store.accessed or store.sources or store.bytes_written]
+    if not touched or not os.path.isdir(root):
+        return
+
+    now = int(time.time())
+    try:
+        with _open_ledger(root) as ledger:
+            for store in touched:
+                store_id = _store_id(store, root)
+                access = ledger['access'].setdefault(store_id, {})
+                accessed, store.accessed = store.accessed, set()
+                for key in accessed:
+                    access[key] = now
+                sources, store.sources = store.sources, {}
+                if sources:
+                    ledger['sources'].setdefault(store_id, {}).update(sources)
+                if ledger['size'] is not None:
+                    ledger['size'] += store.bytes_written
+                store.bytes_written = 0
+            if ledger['size'] is None:
+                ledger['size'] = _measure(_discover_stores(root))
+            over_budget = CACHE_DISK_LIMIT and ledger['size'] > CACHE_DISK_LIMIT
+    except OSError as e:
+        logger.debug(f"Cache ledger update failed: {e}")
+        return
+
+    if over_budget:
+        logger.info(f"🧹 Cache over {CACHE_DISK_LIMIT / (1024 * 1024):.1f}MB, collecting")
+        collect()
+
+def _remove_stale_files(root: str, stores: List[Tuple[str, object]]) -> Tuple[int, int]:
+    temp_removed = legacy_removed = 0
+    cutoff = time.time() - _TEMP_MAX_AGE
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if not name.endswith('.tmp'):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    temp_removed += 1
+            except OSError:
+                pass
+
+    for _, store in stores:
+        if not isinstance(store, FileStore):
+            continue
+        try:
+            legacy = [entry.path for entry in os.scandir(store.directory)
+                      if entry.is_file() and entry.name.endswith(store.file_type)]
+        except OSError:
+            continue
+        for path in legacy:
+            try:
+                os.remove(path)
+                legacy_removed += 1
+            except OSError:
+                pass
+    return temp_removed, legacy_removed
+
+def _find_orphans(stores: List[Tuple[str, object]], sources: Dict[str, Dict[str, str]]) -> Dict[str, set]:
+    exists = {}
+
+    def missing(path: Optional[str]) -> bool:
+        if path is None:
+            return True
+        if path not in exists:
+            exists[path] = os.path.exists(path)
+        return not exists[path]
+
+    orphans = set()
+    for store_id, store in stores:
+        if not store_id.startswith(MANIFEST_FOLDER_NAME):
+            continue
+        for key in store.keys():
+            raw = store.read(key)
+            if missing(ModuleManifest.source_path(raw) if raw is not None else None):
+                orphans.add(key)
+    return {store_id: orphans | {key for key, path in sources.get(store_id, {}).items() if missing(path)}
+            for store_id, _ in stores}
+
+def _delete(stores: List[Tuple[str, object]], doomed: Dict[str, set]) -> int:
+    removed = 0
+    for store_id, store in stores:
+        keys = doomed.get(store_id)
+        if keys:
+            removed += store.delete_batch(keys)
+    return removed
+
+def collect(max_bytes: int = CACHE_DISK_LIMIT, remove_orphans: bool = True) -> Dict[str, int]:
+    root = get_cache_root()
+    summary = {"before": 0, "after": 0, "orphans": 0, "evicted": 0, "temp_files": 0, "legacy_files": 0}
+    if not os.path.isdir(root):
+        return summary
+
+    stores = _discover_stores(root)
+    summary["before"] = _measure(stores)
+    summary["temp_files"], summary["legacy_files"] = _remove_stale_files(root, stores)
+
+    with _open_ledger(root) as ledger:
+        access = ledger['access']
+
+        if remove_orphans:
+            summary["orphans"] = _delete(stores, _find_orphans(stores, ledger['sources']))
+
+        total = _measure(stores)
+        if max_bytes and total > max_bytes:
+            target = max_bytes * CACHE_GC_TARGET_PERCENT // 100
+            candidates = []
+            for store_id, store in stores:
+                store_access = access.get(store_id, {})
+                for key, size in store.entry_sizes().items():
+                    candidates.append((store_access.get(key, 0), size, store_id, key))
+            candidates.sort(key=lambda candidate: (candidate[0], -candidate[1]))
+
+            doomed: Dict[str, set] = {}
+            live_bytes = sum(size for _, size, _, _ in candidates)
+            for _, size, store_id, key in candidates:
+                if live_bytes <= target:
+                    break
+                doomed.setdefault(store_id, set()).add(key)
+                live_bytes -= size
+            summary["evicted"] = _delete(stores, doomed)
+
+        live_keys = {store_id: set(store.keys()) for store_id, store in stores}
+        ledger['access'] = {store_id: {key: stamp for key, stamp in access.get(store_id, {}).items()
+                                       if key in live_keys[store_id]}
+                            for store_id in live_keys}
+        ledger['sources'] = {store_id: {key: path for key, path in ledger['sources'].get(store_id, {}).items()
+                                        if key in live_keys[store_id]}
+                             for store_id in live_keys}
+        summary["after"] = ledger['size'] = _measure(stores)
+
+    for _, store in stores:
+        store.close()
+    return summary
+
+def log_collect(max_bytes: int = CACHE_DISK_LIMIT) -> Dict[str, int]:
+    summary = collect(max_bytes)
+    freed = summary["before"] - summary["after"]
+    logger.info(f"🧹 Cache GC: {summary['before'] / 1024:.1f}KB → {summary['after'] / 1024:.1f}KB "
+                f"({freed / 1024:.1f}KB freed)")
+    logger.info(f"  {summary['orphans']} orphaned, {summary['evicted']} evicted, "
+                f"{summary['temp_files']} stale temp files, {summary['legacy_files']} legacy entries removed")
+
+    global_store = get_global_store()
+    if global_store is not None:
+        global_summary = global_store.collect()
+        summary.update(global_summary)
+        logger.info(f"  Global store {global_store.root}: {global_summary['index_removed']} stale paths, "
+                    f"{global_summary['objects_removed']} unreferenced objects removed")
+    return summary
@@ -0,0 +1,262 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Tuple
+from .phicode_cache_stats import _stats, EVICTIONS
+from ...config.config import CACHE_MAX_SIZE, CACHE_WINDOW_PERCENT, CACHE_PROTECTED_PERCENT
+
+_WINDOW, _PROBATION, _PROTECTED, _PINNED = 0, 1, 2, 3
+_SPREAD = 0x9E3779B1
+
+def estimate_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple):
+        for item in value:
+            size += sys.getsizeof(item)
+            item_dict = getattr(item, '__dict__', None)
+            if item_dict:
+                size += sys.getsizeof(item_dict)
+    return size
+
+class CacheEntry:
+    __slots__ = ('value', 'size', 'hits', 'segment')
+
+    def __init__(self, value, size: int, segment: int, hits: int = 0):
+        self.value = value
+        self.size = size
+        self.segment = segment
+        self.hits = hits
+
+class FrequencySketch:
+    __slots__ = ('_rows', '_mask', '_additions', '_sample_size')
+
+    def __init__(self, capacity: int):
+        width = 1 << min(16, max(6, (max(capacity, 1) * 4 - 1).bit_length()))
+        self._rows = tuple(bytearray(width) for _ in range(4))
+        self._mask = width - 1
+        self._additions = 0
+        self._sample_size = 10 * width
+
+    def _indexes(self, key: Hashable) -> Tuple[int, int, int, int]:
+        h = hash(key) & 0xFFFFFFFF
+        g = (h * _SPREAD) & 0xFFFFFFFF
+        mask = self._mask
+        return h & mask, (h >> 16) & mask, g & mask, (g >> 16) & mask
+
+    def increment(self, key: Hashable):
+        r0, r1, r2, r3 = self._rows
+        a, b, c, d = self._indexes(key)
+        if r0[a] < 15:
+            r0[a] += 1
+        if r1[b] < 15:
+            r1[b] += 1
+        if r2[c] < 15:
+            r2[c] += 1
+        if r3[d] < 15:
+            r3[d] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def frequency(self, key: Hashable) -> int:
+        r0, r1, r2, r3 = self._rows
+        a, b, c, d = self._indexes(key)
+        return min(r0[a], r1[b], r2[c], r3[d])
+
+    def _age(self):
+        self._rows = tuple(bytearray(count >> 1 for count in row) for row in self._rows)
+        self._additions //= 2
+
+class BudgetedCache:
+    def __init__(self, name: str, max_bytes: int, max_entries: int = CACHE_MAX_SIZE, sizer=estimate_size):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._sizer = sizer
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._segments = (OrderedDict(), OrderedDict(), OrderedDict())
+        self._bytes = [0, 0, 0]
+        self._pinned: Dict[Hashable, CacheEntry] = {}
+        self._pinned_bytes = 0
+        self._pin_keys = set()
+        self._window_budget = max(max_bytes * CACHE_WINDOW_PERCENT // 100, 1)
+        self._window_entries = max(max_entries * CACHE_WINDOW_PERCENT // 100, 1)
+        self._main_budget = max(max_bytes - self._window_budget, 1)
+        self._protected_budget = self._main_budget * CACHE_PROTECTED_PERCENT // 100
+        self._sketch = FrequencySketch(max_entries)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._bytes) + self._pinned_bytes
+
+    def _insert(self, key: Hashable, entry: CacheEntry, segment_id: int):
+        entry.segment = segment_id
+        self._entries[key] = entry
+        if segment_id == _PINNED:
+            self._pinned[key] = entry
+            self._pinned_bytes += entry.size
+        else:
+            self._segments[segment_id][key] = entry
+            self._bytes[segment_id] += entry.size
+
+    def _detach(self, key: Hashable, entry: CacheEntry):
+        del self._entries[key]
+        if entry.segment == _PINNED:
+            del self._pinned[key]
+            self._pinned_bytes -= entry.size
+        else:
+            del self._segments[entry.segment][key]
+            self._bytes[entry.segment] -= entry.size
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            self._sketch.increment(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            entry.hits += 1
+            if entry.segment == _PROBATION:
+                self._detach(key, entry)
+                self._insert(key, entry, _PROTECTED)
+                self._demote_protected()
+            elif entry.segment != _PINNED:
+                self._segments[entry.segment].move_to_end(key)
+            return entry.value
+
+    def put(self, key: Hashable, value, pinned: bool = False):
+        with self._lock:
+            existing = self._entries.get(key)
+            hits = 0
+            if existing is not None:
+                hits = existing.hits
+                pinned = pinned or existing.segment == _PINNED
+                self._detach(key, existing)
+
+            entry = CacheEntry(value, self._sizer(value), _WINDOW, hits)
+            if pinned or key in self._pin_keys:
+                self._insert(key, entry, _PINNED)
+                return
+
+            self._insert(key, entry, _WINDOW)
+            self._drain_window()
+
+    def pop(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._detach(key, entry)
+            return entry.value
+
+    def pin(self, key: Hashable):
+        with self._lock:
+            self._pin_keys.add(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry.segment != _PINNED:
+                self._detach(key, entry)
+                self._insert(key, entry, _PINNED)
+
+    def unpin(self, key: Hashable):
+        with self._lock:
+            self._pin_keys.discard(key)
+            entry = self._pinned.get(key)
+            if entry is not None:
+                self._detach(key, entry)
+                self._insert(key, entry, _PROBATION)
+                self._admit_overflow()
+
+    def clear(self):
+        with self._lock:
+            for segment in self._segments:
+                segment.clear()
+            self._bytes = [0, 0, 0]
+            self._entries.clear()
+            self._pinned.clear()
+            self._pinned_bytes = 0
+
+    def _evict(self):
+        self.evictions += 1
+        _stats.add(self.name, EVICTIONS)
+
+    def _demote_protected(self):
+        protected = self._segments[_PROTECTED]
+        while self._bytes[_PROTECTED] > self._protected_budget and len(protected) > 1:
+            key, entry = protected.popitem(last=False)
+            self._bytes[_PROTECTED] -= entry.size
+            self._insert(key, entry, _PROBATION)
+
+    def _drain_window(self):
+        window = self._segments[_WINDOW]
+        while window and (self._bytes[_WINDOW] > self._window_budget or len(window) > self._window_entries):
+            key, candidate = window.popitem(last=False)
+            self._bytes[_WINDOW] -= candidate.size
+            del self._entries[key]
+            self._admit(key, candidate)
+
+    def _main_entries(self) -> int:
+        return len(self._segments[_PROBATION]) + len(self._segments[_PROTECTED])
+
+    def _victims_for(self, needed_bytes: int) -> List[Tuple[Hashable, CacheEntry]]:
+        victims = []
+        freed = 0
+        entries = self._main_entries()
+        for segment_id in (_PROBATION, _PROTECTED):
+            for key, entry in self._segments[segment_id].items():
+                if freed >= needed_bytes and entries - len(victims) < self.max_entries:
+                    return victims
+                victims.append((key, entry))
+                freed += entry.size
+        return victims
+
+    def _admit(self, key: Hashable, candidate: CacheEntry):
+        if candidate.size > self._main_budget:
+            self._evict()
+            return
+
+        main_bytes = self._bytes[_PROBATION] + self._bytes[_PROTECTED]
+        needed = main_bytes + candidate.size - self._main_budget
+        if needed > 0 or self._main_entries() >= self.max_entries:
+            victims = self._victims_for(max(needed, 0))
+            candidate_freq = self._sketch.frequency(key)
+            if any(self._sketch.frequency(victim_key) >= candidate_freq for victim_key, _ in victims):
+                self._evict()
+                return
+            for victim_key, victim in victims:
+                self._detach(victim_key, victim)
+                self._evict()
+
+        self._insert(key, candidate, _PROBATION)
+
+    def _admit_overflow(self):
+        probation = self._segments[_PROBATION]
+        while probation and (self._bytes[_PROBATION] + self._bytes[_PROTECTED] > self._main_budget
+                             or self._main_entries() > self.max_entries):
+            key, entry = probation.popitem(last=False)
+            self._bytes[_PROBATION] -= entry.size
+            del self._entries[key]
+            self._evict()
+
+    def memory_report(self, top: int = 5) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self._entries.items())
+            largest = sorted(entries, key=lambda item: item[1].size, reverse=True)[:top]
+            return {
+                "bytes": self.total_bytes,
+                "budget": self.max_bytes,
+                "entries": len(entries),
+                "pinned": len(self._pinned),
+                "evictions": self.evictions,
+                "largest": [(str(key), entry.size, entry.hits) for key, entry in largest],
+            }
@@ -0,0 +1,36 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+from ..phicode_logger import logger
+
+def _format_bytes(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+def log_memory_report(top: int = 5):
+    from .phicode_cache import cache_memory_report
+    report = cache_memory_report(top)
+
+    logger.info("🧠 Cache memory report:")
+    for layer, data in sorted(report.items(), key=lambda item: item[1]["bytes"], reverse=True):
+        logger.info(f"  {layer}: {_format_bytes(data['bytes'])} / {_format_bytes(data['budget'])} "
+                    f"({data['entries']} entries, {data['pinned']} pinned, {data['evictions']} evictions)")
+        for key, size, hits in data["largest"]:
+            logger.info(f"    {_format_bytes(size):>8}  {hits:>5} hits  {key}")
+
+
+def log_stats_report():
+    from .phicode_cache_stats import stats
+    report = stats()
+
+    logger.info(f"📊 Cache stats after {report['uptime']:.2f}s:")
+    for layer, data in report["layers"].items():
+        if not data["hits"] and not data["misses"]:
+            continue
+        logger.info(f"  {layer}: {data['hits']} hits / {data['misses']} misses ({data['hit_rate']:.1%}), "
+                    f"{data['evictions']} evictions, {data['invalidations']} invalidations, "
+                    f"{data['integrity_failures']} integrity failures, {_format_bytes(data['bytes_read'])} read, "
+                    f"{data['time_ns'] / 1e6:.2f}ms")
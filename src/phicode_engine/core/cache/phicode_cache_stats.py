@@ -0,0 +1,83 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import time
+from threading import Lock, local
+from typing import Dict, List
+
+LAYERS = ('source', 'python', 'spec', 'interpreter_hint', 'bytecode', 'manifest', 'shared', 'global', 'remote', 'negative', 'chunk')
+FIELDS = ('hits', 'misses', 'evictions', 'invalidations', 'integrity_failures', 'bytes_read', 'time_ns')
+HITS, MISSES, EVICTIONS, INVALIDATIONS, INTEGRITY_FAILURES, BYTES_READ, TIME_NS = range(len(FIELDS))
+
+class CacheStats:
+    def __init__(self):
+        self._local = local()
+        self._shards: List[Dict[str, List[int]]] = []
+        self._lock = Lock()
+        self._started = time.perf_counter()
+
+    def _shard(self) -> Dict[str, List[int]]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {layer: [0] * len(FIELDS) for layer in LAYERS}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def counters(self, layer: str) -> List[int]:
+        shard = self._shard()
+        counters = shard.get(layer)
+        if counters is None:
+            counters = shard[layer] = [0] * len(FIELDS)
+        return counters
+
+    def hit(self, layer: str, nbytes: int = 0, elapsed_ns: int = 0):
+        counters = self.counters(layer)
+        counters[HITS] += 1
+        counters[BYTES_READ] += nbytes
+        counters[TIME_NS] += elapsed_ns
+
+    def miss(self, layer: str, nbytes: int = 0, elapsed_ns: int = 0):
+        counters = self.counters(layer)
+        counters[MISSES] += 1
+        counters[BYTES_READ] += nbytes
+        counters[TIME_NS] += elapsed_ns
+
+    def add(self, layer: str, field: int, amount: int = 1):
+        self.counters(layer)[field] += amount
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            shards = list(self._shards)
+
+        layers = {}
+        for shard in shards:
+            for layer, counters in list(shard.items()):
+                totals = layers.setdefault(layer, [0] * len(FIELDS))
+                for i, value in enumerate(counters):
+                    totals[i] += value
+
+        report = {}
+        for layer, totals in layers.items():
+            data = dict(zip(FIELDS, totals))
+            lookups = data['hits'] + data['misses']
+            data['hit_rate'] = data['hits'] / lookups if lookups else 0.0
+            report[layer] = data
+        return {"uptime": time.perf_counter() - self._started, "layers": report}
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                for counters in list(shard.values()):
+                    counters[:] = [0] * len(FIELDS)
+            self._started = time.perf_counter()
+
+_stats = CacheStats()
+
+def stats() -> Dict[str, object]:
+    return _stats.snapshot()
+
+def reset_stats():
+    _stats.reset()
@@ -0,0 +1,121 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import atexit
+import os
+import time
+from threading import Condition, Thread, current_thread
+from typing import Dict, Tuple
+from ..phicode_logger import logger
+from ...config.config import CACHE_BATCH_SIZE, CACHE_FSYNC_MODE, CACHE_WRITER_LINGER, CACHE_WRITER_DRAIN_TIMEOUT
+
+FSYNC_MODES = ('none', 'batch', 'file', 'exit')
+
+class CacheWriter:
+    def __init__(self, fsync_mode: str = CACHE_FSYNC_MODE):
+        if fsync_mode not in FSYNC_MODES:
+            logger.warning(f"Unknown fsync mode '{fsync_mode}', using 'batch'")
+            fsync_mode = 'batch'
+        self.fsync_mode = fsync_mode
+        self._reset()
+        self._atexit_registered = False
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._cond = Condition()
+        self._pending: Dict[Tuple[object, str], object] = {}
+        self._thread = None
+        self._busy = False
+        self._draining = 0
+        self._unsynced = set()
+
+    def _ensure_thread(self) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        try:
+            self._thread = Thread(target=self._run, name="phicode-cache-writer", daemon=True)
+            self._thread.start()
+        except RuntimeError:
+            self._thread = None
+            return False
+        if not self._atexit_registered:
+            atexit.register(self.drain)
+            self._atexit_registered = True
+        return True
+
+    def submit(self, store, key: str, data):
+        with self._cond:
+            self._pending[(store, key)] = data
+            started = self._ensure_thread()
+            self._cond.notify_all()
+        if not started:
+            self.drain()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.monotonic() + CACHE_WRITER_LINGER
+                while len(self._pending) < CACHE_BATCH_SIZE and not self._draining:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                pending, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                self._write(pending)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, pending: Dict[Tuple[object, str], object]):
+        batches = {}
+        for (store, key), data in pending.items():
+            batches.setdefault(store, []).append((key, data))
+
+        for store, items in batches.items():
+            try:
+                store.write_batch(items, fsync=self.fsync_mode)
+                if self.fsync_mode == 'exit':
+                    self._unsynced.add(store)
+            except Exception as e:
+                logger.warning(f"Batch cache write failed: {e}")
+
+    def drain(self, timeout: float = CACHE_WRITER_DRAIN_TIMEOUT) -> bool:
+        drained = True
+        thread = self._thread
+        if thread is None or not thread.is_alive() or thread is current_thread():
+            with self._cond:
+                pending, self._pending = self._pending, {}
+            self._write(pending)
+        else:
+            deadline = time.monotonic() + timeout
+            with self._cond:
+                self._draining += 1
+                self._cond.notify_all()
+                try:
+                    while self._pending or self._busy:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            logger.warning(f"Cache writer did not drain within {timeout:.1f}s, "
+                                           f"{len(self._pending)} writes still pending")
+                            drained = False
+                            break
+                        self._cond.wait(remaining)
+                finally:
+                    self._draining -= 1
+
+        if self._unsynced:
+            stores, self._unsynced = self._unsynced, set()
+            for store in stores:
+                try:
+                    store.sync()
+                except OSError as e:
+                    logger.warning(f"Cache sync failed: {e}")
+        return drained
+
+_writer = CacheWriter()
@@ -0,0 +1,107 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import hashlib
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple
+from .phicode_cache_policy import BudgetedCache
+from .phicode_cache_stats import _stats
+from ..transpilation.phicode_to_python import transpile_symbols
+from ..transpilation.symbol_scanner import iter_top_level_lines
+from ...config.config import (CACHE_CHUNK_BYTES, CHUNK_CACHE_MAX_ENTRIES, CHUNK_MIN_SOURCE, CHUNK_MIN_SIZE,
+                              CHUNK_ANCHOR_MASK, CHUNK_TRACKED_PATHS)
+
+_ANCHOR_CHARS = 32
+
+def _boundaries(source: str, start: int = 0, broken: Optional[List[int]] = None) -> Iterator[int]:
+    last = start
+    for line in iter_top_level_lines(source, start=start, broken=broken):
+        if line - last < CHUNK_MIN_SIZE:
+            continue
+        anchor = source[line:line + _ANCHOR_CHARS].encode('utf-8', 'surrogatepass')
+        if zlib.crc32(anchor) & CHUNK_ANCHOR_MASK == 0:
+            yield line
+            last = line
+
+def split_chunks(source: str, broken: Optional[List[int]] = None) -> List[str]:
+    bounds = [0, *_boundaries(source, broken=broken), len(source)]
+    return [source[start:end] for start, end in zip(bounds, bounds[1:])]
+
+def _keyed(chunk: str) -> Tuple[str, bytes]:
+    return chunk, hashlib.blake2b(chunk.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+def _resplit(source: str, previous: List[Tuple[str, bytes]], broken: List[int]) -> List[Tuple[str, bytes]]:
+    head = offset = 0
+    while head < len(previous) - 1 and source.startswith(previous[head][0], offset):
+        offset += len(previous[head][0])
+        head += 1
+    kept = max(head - 1, 0)
+    restart = sum(len(chunk) for chunk, _ in previous[:kept])
+
+    tail, end = len(previous), len(source)
+    while tail > max(kept, 1) and source.endswith(previous[tail - 1][0], restart, end):
+        end -= len(previous[tail - 1][0])
+        tail -= 1
+    synced = {}
+    for index in range(tail, len(previous)):
+        synced[end] = index
+        end += len(previous[index][0])
+
+    chunks = previous[:kept]
+    last = restart
+    for line in _boundaries(source, restart, broken):
+        chunks.append(_keyed(source[last:line]))
+        last = line
+        if line in synced:
+            chunks.extend(previous[synced[line]:])
+            return chunks
+    chunks.append(_keyed(source[last:]))
+    return chunks
+
+class ChunkCache:
+    def __init__(self, max_bytes: int = CACHE_CHUNK_BYTES):
+        self.layer = BudgetedCache('chunk', max_bytes, CHUNK_CACHE_MAX_ENTRIES)
+        self._layouts = OrderedDict()
+        self._lock = Lock()
+
+    def transpile(self, source: str, identity: Optional[str] = None) -> str:
+        if identity is None or len(source) < CHUNK_MIN_SOURCE:
+            return transpile_symbols(source)
+        with self._lock:
+            seen = identity in self._layouts
+            previous = self._layouts.get(identity)
+        if not seen:
+            self._remember(identity, None)
+            return transpile_symbols(source)
+
+        broken = []
+        if previous:
+            chunks = _resplit(source, previous, broken)
+        else:
+            chunks = [_keyed(chunk) for chunk in split_chunks(source, broken)]
+        self._remember(identity, None if broken else chunks)
+        return ''.join([self._transpile_chunk(chunk, key) for chunk, key in chunks])
+
+    def _remember(self, identity: str, chunks: Optional[List[Tuple[str, bytes]]]):
+        with self._lock:
+            self._layouts[identity] = chunks
+            self._layouts.move_to_end(identity)
+            while len(self._layouts) > CHUNK_TRACKED_PATHS:
+                self._layouts.popitem(last=False)
+
+    def _transpile_chunk(self, chunk: str, key: bytes) -> str:
+        python_chunk = self.layer.get(key)
+        if python_chunk is not None:
+            _stats.hit('chunk')
+            return python_chunk
+        python_chunk = transpile_symbols(chunk)
+        self.layer.put(key, python_chunk)
+        _stats.miss('chunk', len(chunk))
+        return python_chunk
+
+_chunks = ChunkCache()
+
+def transpile_chunked(source: str, identity: Optional[str] = None) -> str:
+    return _chunks.transpile(source, identity)
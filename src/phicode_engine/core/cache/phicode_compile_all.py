@@ -0,0 +1,130 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import marshal
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from ..phicode_logger import logger
+from ..importing.phicode_central import discover_phi_directories
+from ..transpilation.phicode_to_python import transpile_symbols
+from .phicode_bytecode import (BytecodeManager, _encode_payload, _queue_cache_write, _flush_batch_writes,
+                               _publish_global, _publish_remote)
+from .phicode_cache_validation import CacheValidation
+from .phicode_manifest import _manifest
+from .phicode_load_context import content_digest
+from .phicode_frozen import indexed_modules, module_key, write_index
+from .phicode_cache_gc import update_ledger
+from ...config.config import MAIN_FILE_TYPE, TERTIARY_FILE_TYPE, IMPORT_ANALYSIS_ENABLED, MANIFEST_ENABLED
+
+_PHI_EXTENSIONS = (MAIN_FILE_TYPE, TERTIARY_FILE_TYPE)
+
+def find_phi_sources(root_path: str) -> List[str]:
+    root_path = os.path.realpath(root_path)
+    if os.path.isfile(root_path):
+        return [root_path] if root_path.endswith(_PHI_EXTENSIONS) else []
+
+    sources = []
+    for directory in discover_phi_directories(root_path, extensions=_PHI_EXTENSIONS):
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            if entry.is_file() and entry.name.endswith(_PHI_EXTENSIONS):
+                sources.append(os.path.join(directory, entry.name))
+    return sources
+
+def _compile_source(path: str) -> Tuple[str, Optional[tuple], float, Optional[str]]:
+    started = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = content_digest(raw)
+        python_source = transpile_symbols(raw.decode('utf-8'))
+        code = compile(python_source, path, 'exec', optimize=2, dont_inherit=True)
+    except SyntaxError as e:
+        return path, None, time.perf_counter() - started, f"line {e.lineno}: {e.msg}"
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return path, None, time.perf_counter() - started, str(e)
+
+    if IMPORT_ANALYSIS_ENABLED:
+        interpreter_hint = CacheValidation()._quick_interpreter_check(python_source)
+    else:
+        interpreter_hint = sys.executable
+    result = (python_source, interpreter_hint, marshal.dumps(code), digest)
+    return path, result, time.perf_counter() - started, None
+
+def _is_fresh(path: str, indexed) -> bool:
+    if module_key(path) not in indexed:
+        return False
+    entry = _manifest.lookup(_manifest.stat_key(path))
+    return entry is not None and entry.code is not None
+
+def _store_result(path: str, result: tuple, store) -> str:
+    python_source, interpreter_hint, code_bytes, digest = result
+    key = BytecodeManager._fast_hash_path(path)
+    data = _encode_payload(code_bytes, digest[:8])
+    _queue_cache_write(store, key, data)
+    store.sources[key] = path
+    _publish_global(key, path, digest, data)
+    _publish_remote(digest, data)
+    _manifest.record(_manifest.stat_key(path), python_source, interpreter_hint, marshal.loads(code_bytes))
+    return key
+
+def compile_all(root_path: str = ".", incremental: bool = False, jobs: Optional[int] = None) -> int:
+    sources = find_phi_sources(root_path)
+    if not sources:
+        logger.warning(f"No φ sources found under {os.path.abspath(root_path)}")
+        return 0
+
+    skipped = 0
+    if incremental:
+        if not MANIFEST_ENABLED:
+            logger.warning("Incremental compile needs the module manifest, compiling everything")
+        else:
+            indexed = indexed_modules()
+            pending = [path for path in sources if not _is_fresh(path, indexed)]
+            skipped = len(sources) - len(pending)
+            sources = pending
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(sources) or 1))
+    logger.info(f"⚙️  Compiling {len(sources)} φ sources with {jobs} worker(s)"
+                + (f", {skipped} up to date" if skipped else ""))
+
+    store = BytecodeManager._get_store()
+    failures = 0
+    compiled = {}
+    started = time.perf_counter()
+
+    if jobs == 1:
+        results = map(_compile_source, sources)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(_compile_source, sources, chunksize=max(1, len(sources) // (jobs * 4)))
+
+    try:
+        for path, result, elapsed, error in results:
+            relative = os.path.relpath(path)
+            if error is not None:
+                failures += 1
+                logger.error(f"❌ {relative}: {error}")
+                continue
+            key = _store_result(path, result, store)
+            compiled[module_key(path)] = (result[3], key)
+            logger.info(f"✅ {elapsed * 1000:8.2f}ms  {relative}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _flush_batch_writes()
+        update_ledger()
+        if compiled:
+            try:
+                write_index(compiled)
+            except OSError as e:
+                failures += 1
+                logger.error(f"❌ Failed to write module index: {e}")
+
+    total = time.perf_counter() - started
+    logger.info(f"📦 Compiled {len(sources) - failures}/{len(sources)} sources in {total:.2f}s"
+                + (f", {failures} failed" if failures else ""))
+    return 1 if failures else 0
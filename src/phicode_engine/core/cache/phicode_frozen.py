@@ -0,0 +1,94 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import importlib.util
+import marshal
+import os
+import sys
+from typing import Dict, Optional, Tuple
+from .phicode_store import get_cache_root
+from .phicode_temp_files import track_temp_file, untrack_temp_file
+from ...config.config import FROZEN_MODE, FROZEN_INDEX_NAME, GLOBAL_INDEX_FILE_TYPE
+
+_FROZEN_INDEX_FORMAT = 2
+
+_frozen = FROZEN_MODE
+_modules: Optional[Dict[str, Tuple[bytes, str]]] = None
+_project_root: Optional[str] = None
+
+class FrozenCacheError(ImportError):
+    pass
+
+def is_frozen() -> bool:
+    return _frozen
+
+def set_frozen(enabled: bool = True):
+    global _frozen
+    _frozen = enabled
+
+def index_path() -> str:
+    return os.path.join(get_cache_root(), FROZEN_INDEX_NAME + GLOBAL_INDEX_FILE_TYPE)
+
+def project_root() -> str:
+    global _project_root
+    if _project_root is None:
+        _project_root = os.path.dirname(os.path.realpath(get_cache_root()))
+    return _project_root
+
+def module_key(path: str) -> str:
+    try:
+        return os.path.relpath(path, project_root()).replace(os.sep, '/')
+    except ValueError:
+        return path
+
+def _read_index(path: str) -> Optional[dict]:
+    try:
+        with open(path, 'rb') as f:
+            index = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(index, dict) or index.get('format') != _FROZEN_INDEX_FORMAT:
+        return None
+    return index
+
+def _is_current(index: dict) -> bool:
+    return index['cache_tag'] == sys.implementation.cache_tag and index['magic'] == importlib.util.MAGIC_NUMBER
+
+def indexed_modules() -> Dict[str, Tuple[bytes, str]]:
+    index = _read_index(index_path())
+    return dict(index['modules']) if index is not None and _is_current(index) else {}
+
+def write_index(modules: Dict[str, Tuple[bytes, str]]):
+    path = index_path()
+    root = project_root()
+    merged = {source: entry for source, entry in indexed_modules().items()
+              if os.path.exists(os.path.join(root, source))}
+    merged.update(modules)
+    data = marshal.dumps({'format': _FROZEN_INDEX_FORMAT, 'cache_tag': sys.implementation.cache_tag,
+                          'magic': importlib.util.MAGIC_NUMBER, 'modules': merged})
+    tmp_path = track_temp_file(f"{path}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        untrack_temp_file(tmp_path)
+
+def frozen_modules() -> Dict[str, Tuple[bytes, str]]:
+    global _modules
+    if _modules is None:
+        path = index_path()
+        index = _read_index(path)
+        if index is None:
+            raise FrozenCacheError(f"Frozen mode needs a prebuilt module index at {path}; "
+                                   f"build it with 'phicode --compile-all' first")
+        if not _is_current(index):
+            raise FrozenCacheError(f"Module index at {path} was built for {index['cache_tag']}, "
+                                   f"not {sys.implementation.cache_tag}; rebuild it with 'phicode --compile-all'")
+        _modules = index['modules']
+    return _modules
+
+def frozen_entry(path: str) -> Optional[Tuple[bytes, str]]:
+    return frozen_modules().get(module_key(path))
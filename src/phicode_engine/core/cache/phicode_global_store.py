@@ -0,0 +1,76 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import marshal
+import os
+import sys
+from typing import Dict, Optional
+from ..phicode_logger import logger
+from .phicode_store import FileStore
+from .phicode_cache_writer import _writer
+from ...config.config import (CACHE_FILE_TYPE, GLOBAL_CACHE_ENABLED, GLOBAL_CACHE_DIR, GLOBAL_CACHE_FOLDER_NAME,
+                              GLOBAL_OBJECTS_NAME, GLOBAL_INDEX_NAME, GLOBAL_INDEX_FILE_TYPE)
+
+def get_global_root() -> str:
+    if GLOBAL_CACHE_DIR:
+        return os.path.abspath(os.path.expanduser(GLOBAL_CACHE_DIR))
+    base = os.environ.get('XDG_CACHE_HOME')
+    if not base and os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA')
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, GLOBAL_CACHE_FOLDER_NAME)
+
+class GlobalStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.objects = FileStore(os.path.join(root, f"{GLOBAL_OBJECTS_NAME}_{sys.implementation.cache_tag}"),
+                                 CACHE_FILE_TYPE)
+        self.index = FileStore(os.path.join(root, GLOBAL_INDEX_NAME), GLOBAL_INDEX_FILE_TYPE)
+
+    @staticmethod
+    def content_key(digest: bytes) -> str:
+        return digest.hex()[:32]
+
+    def read(self, content_key: str) -> Optional[bytes]:
+        return self.objects.read(content_key)
+
+    def publish(self, path_key: str, path: str, content_key: str, data, exists: bool = False):
+        if not exists:
+            _writer.submit(self.objects, content_key, data)
+        raw = self.index.read(path_key)
+        try:
+            if raw is not None and marshal.loads(raw) == (path, content_key):
+                return
+        except (EOFError, ValueError, TypeError):
+            pass
+        _writer.submit(self.index, path_key, marshal.dumps((path, content_key)))
+
+    def collect(self) -> Dict[str, int]:
+        summary = {"index_removed": 0, "objects_removed": 0}
+        live = set()
+        stale = []
+        for path_key in self.index.keys():
+            raw = self.index.read(path_key)
+            try:
+                path, content_key = marshal.loads(raw) if raw is not None else (None, None)
+            except (EOFError, ValueError, TypeError):
+                path = content_key = None
+            if path is None or not os.path.exists(path):
+                stale.append(path_key)
+            else:
+                live.add(content_key)
+        summary["index_removed"] = self.index.delete_batch(stale)
+        summary["objects_removed"] = self.objects.delete_batch(key for key in self.objects.keys() if key not in live)
+        return summary
+
+_global_store = None
+
+def get_global_store() -> Optional[GlobalStore]:
+    global _global_store
+    if not GLOBAL_CACHE_ENABLED:
+        return None
+    if _global_store is None:
+        _global_store = GlobalStore(get_global_root())
+        logger.debug(f"Global bytecode store at {_global_store.root}")
+    return _global_store
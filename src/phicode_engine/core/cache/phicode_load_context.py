@@ -0,0 +1,47 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import hashlib
+from functools import lru_cache
+from typing import Optional
+from ..transpilation.phicode_to_python import get_symbol_fingerprint
+
+try:
+    import xxhash
+    _HAS_XXHASH = True
+except ImportError:
+    _HAS_XXHASH = False
+
+DIGEST_SIZE = 16
+
+@lru_cache(maxsize=1)
+def _digest_seed() -> bytes:
+    return bytes.fromhex(get_symbol_fingerprint())
+
+def content_digest(data) -> bytes:
+    if _HAS_XXHASH:
+        return xxhash.xxh3_128_digest(data, seed=int.from_bytes(_digest_seed(), 'little'))
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE, key=_digest_seed()).digest()
+
+class ModuleLoadContext:
+    __slots__ = ('path', 'raw', 'digest', '_source')
+
+    def __init__(self, path: str, raw: bytes, digest: Optional[bytes] = None):
+        self.path = path
+        self.raw = raw
+        self.digest = digest if digest is not None else content_digest(raw)
+        self._source = None
+
+    @property
+    def key(self) -> str:
+        return self.digest.hex()
+
+    @property
+    def source_hash(self) -> bytes:
+        return self.digest[:8]
+
+    @property
+    def source(self) -> str:
+        if self._source is None:
+            self._source = self.raw.decode('utf-8')
+        return self._source
@@ -0,0 +1,105 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import importlib.util
+import marshal
+import os
+import time
+from typing import Optional, Tuple
+from ..phicode_logger import logger
+from .phicode_bytecode import BytecodeManager, _queue_cache_write, _payload_checksum, _HAS_XXHASH
+from .phicode_store import open_store
+from .phicode_cache_stats import _stats, INVALIDATIONS, INTEGRITY_FAILURES
+from ..transpilation.phicode_to_python import get_symbol_fingerprint
+from ...config.config import MANIFEST_FOLDER_NAME, MANIFEST_FILE_TYPE, MANIFEST_ENABLED, MANIFEST_RACY_WINDOW
+
+_MANIFEST_FORMAT = 2
+
+class ManifestEntry:
+    __slots__ = ('python_source', 'interpreter_hint', 'code')
+
+    def __init__(self, python_source: Optional[str], interpreter_hint: str, code=None):
+        self.python_source = python_source
+        self.interpreter_hint = interpreter_hint
+        self.code = code
+
+class ModuleManifest:
+    def __init__(self, store_name: str = MANIFEST_FOLDER_NAME):
+        self.store_name = store_name
+
+    def _store(self):
+        return open_store(self.store_name, MANIFEST_FILE_TYPE)
+
+    def stat_key(self, canon_path: str) -> Optional[Tuple]:
+        if not MANIFEST_ENABLED:
+            return None
+        try:
+            st = os.stat(canon_path)
+        except OSError:
+            return None
+        return (canon_path, st.st_size, st.st_mtime_ns, st.st_ino, get_symbol_fingerprint())
+
+    def lookup(self, stat_key: Optional[Tuple]) -> Optional[ManifestEntry]:
+        if stat_key is None:
+            return None
+        started = time.perf_counter_ns()
+        raw = self._store().read(BytecodeManager._fast_hash_path(stat_key[0]))
+        if raw is None:
+            _stats.miss('manifest', elapsed_ns=time.perf_counter_ns() - started)
+            return None
+        try:
+            use_xxh3 = raw[0] == 1
+            if len(raw) < 9 or (use_xxh3 and not _HAS_XXHASH) or _payload_checksum(raw[9:], use_xxh3) != bytes(raw[1:9]):
+                logger.debug(f"Manifest entry for {stat_key[0]} failed checksum, rebuilding")
+                _stats.add('manifest', INTEGRITY_FAILURES)
+                _stats.miss('manifest', len(raw), time.perf_counter_ns() - started)
+                return None
+            fmt, key, python_source, interpreter_hint, magic, code_bytes = marshal.loads(raw[9:])
+        except (EOFError, ValueError, TypeError):
+            _stats.add('manifest', INTEGRITY_FAILURES)
+            _stats.miss('manifest', len(raw), time.perf_counter_ns() - started)
+            return None
+
+        if fmt != _MANIFEST_FORMAT or key != stat_key:
+            _stats.add('manifest', INVALIDATIONS)
+            _stats.miss('manifest', len(raw), time.perf_counter_ns() - started)
+            return None
+
+        code = None
+        if magic == importlib.util.MAGIC_NUMBER:
+            try:
+                code = marshal.loads(code_bytes)
+            except (EOFError, ValueError, TypeError):
+                _stats.add('manifest', INTEGRITY_FAILURES)
+                logger.debug(f"Manifest bytecode unreadable for {stat_key[0]}, recompiling")
+        if code is None and python_source is None:
+            _stats.miss('manifest', len(raw), time.perf_counter_ns() - started)
+            return None
+        _stats.hit('manifest', len(raw), time.perf_counter_ns() - started)
+        return ManifestEntry(python_source, interpreter_hint, code)
+
+    @staticmethod
+    def source_path(raw) -> Optional[str]:
+        try:
+            use_xxh3 = raw[0] == 1
+            if len(raw) < 9 or (use_xxh3 and not _HAS_XXHASH) or _payload_checksum(raw[9:], use_xxh3) != bytes(raw[1:9]):
+                return None
+            return marshal.loads(raw[9:])[1][0]
+        except (EOFError, ValueError, TypeError, IndexError):
+            return None
+
+    def record(self, stat_key: Optional[Tuple], python_source: Optional[str], interpreter_hint: str, code):
+        if stat_key is None:
+            return
+        if time.time() - stat_key[2] / 1e9 < MANIFEST_RACY_WINDOW:
+            return
+
+        try:
+            payload = marshal.dumps((_MANIFEST_FORMAT, stat_key, python_source, interpreter_hint,
+                                     importlib.util.MAGIC_NUMBER, marshal.dumps(code)))
+            data = bytes([1 if _HAS_XXHASH else 0]) + _payload_checksum(payload, _HAS_XXHASH) + payload
+            _queue_cache_write(self._store(), BytecodeManager._fast_hash_path(stat_key[0]), data)
+        except ValueError as e:
+            logger.debug(f"Failed to record manifest entry for {stat_key[0]}: {e}")
+
+_manifest = ModuleManifest()
@@ -0,0 +1,315 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import os
+import mmap
+import struct
+import time
+import zlib
+from threading import RLock
+from typing import Dict, Iterable, Optional, Tuple
+from ..phicode_logger import logger
+from .phicode_temp_files import track_temp_file, untrack_temp_file
+from ...config.config import PACK_COMPACT_MIN_BYTES, CACHE_FSYNC_MODE
+
+if os.name == 'nt':
+    import msvcrt
+
+    _LOCK_OFFSET = 0x7FFFFFFF
+
+    def _lock_fd(fd: int):
+        os.lseek(fd, _LOCK_OFFSET, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(0.005)
+
+    def _unlock_fd(fd: int):
+        os.lseek(fd, _LOCK_OFFSET, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_fd(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_fd(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+# Header: magic | format | two commit slots (seq, index offset, index length, index crc, slot crc)
+_PACK_MAGIC = b'PHPK'
+_PACK_FORMAT = 1
+_SLOT = struct.Struct('<QQII')
+_SLOT_SIZE = _SLOT.size + 4
+_HEADER_SIZE = 8 + 2 * _SLOT_SIZE
+_RECORD = struct.Struct('<8sI')
+_INDEX_ENTRY = struct.Struct('<8sQI')
+_EMPTY_HEADER = _PACK_MAGIC + _PACK_FORMAT.to_bytes(4, 'little') + b'\0' * (2 * _SLOT_SIZE)
+
+def _encode_slot(seq: int, index_offset: int, index_length: int, index_crc: int) -> bytes:
+    body = _SLOT.pack(seq, index_offset, index_length, index_crc)
+    return body + zlib.crc32(body).to_bytes(4, 'little')
+
+def _decode_slot(raw: bytes) -> Optional[Tuple[int, int, int, int]]:
+    body, crc = raw[:_SLOT.size], raw[_SLOT.size:_SLOT_SIZE]
+    if len(crc) < 4 or zlib.crc32(body) != int.from_bytes(crc, 'little'):
+        return None
+    return _SLOT.unpack(body)
+
+class PackStore:
+    def __init__(self, pack_path: str):
+        self.pack_path = pack_path
+        self._lock = RLock()
+        self._mm = None
+        self._mapped_ident = None
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._unsynced = False
+        self.accessed = set()
+        self.sources = {}
+        self.bytes_written = 0
+
+    @staticmethod
+    def _key_bytes(key: str) -> bytes:
+        return bytes.fromhex(key)[:8].ljust(8, b'\0')
+
+    def _read_committed(self, buffer) -> Tuple[Optional[Tuple[int, int, int, int]], int]:
+        if len(buffer) < _HEADER_SIZE or bytes(buffer[:4]) != _PACK_MAGIC:
+            return None, 0
+        if int.from_bytes(buffer[4:8], 'little') != _PACK_FORMAT:
+            return None, 0
+
+        best, best_slot = None, 0
+        for slot_no in (0, 1):
+            start = 8 + slot_no * _SLOT_SIZE
+            slot = _decode_slot(bytes(buffer[start:start + _SLOT_SIZE]))
+            if slot is None:
+                continue
+            seq, index_offset, index_length, index_crc = slot
+            if index_offset + index_length > len(buffer):
+                continue
+            if zlib.crc32(buffer[index_offset:index_offset + index_length]) != index_crc:
+                continue
+            if best is None or seq > best[0]:
+                best, best_slot = slot, slot_no
+        return best, best_slot
+
+    def _parse_index(self, buffer, slot) -> Dict[bytes, Tuple[int, int]]:
+        if slot is None:
+            return {}
+        _, index_offset, index_length, _ = slot
+        return {key: (offset, length) for key, offset, length in
+                _INDEX_ENTRY.iter_unpack(buffer[index_offset:index_offset + index_length])}
+
+    def _release_map(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+        self._mm = None
+        self._mapped_ident = None
+        self._index = {}
+
+    def _map(self):
+        self._release_map()
+        try:
+            with open(self.pack_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if st.st_size < _HEADER_SIZE:
+                    self._mapped_ident = (st.st_ino, st.st_size)
+                    return
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mapped_ident = (st.st_ino, st.st_size)
+        except (OSError, ValueError):
+            return
+
+        slot, _ = self._read_committed(self._mm)
+        self._index = self._parse_index(self._mm, slot)
+
+    def _is_stale(self) -> bool:
+        try:
+            st = os.stat(self.pack_path)
+        except OSError:
+            return self._mapped_ident is not None
+        return self._mapped_ident != (st.st_ino, st.st_size)
+
+    def read(self, key: str):
+        key_bytes = self._key_bytes(key)
+        with self._lock:
+            if self._mapped_ident is None or (key_bytes not in self._index and self._is_stale()):
+                self._map()
+            location = self._index.get(key_bytes)
+            if location is None or self._mm is None:
+                return None
+            self.accessed.add(key)
+            offset, length = location
+            return memoryview(self._mm)[offset:offset + length]
+
+    def keys(self) -> Iterable[str]:
+        with self._lock:
+            if self._mapped_ident is None or self._is_stale():
+                self._map()
+            return [key.hex() for key in self._index]
+
+    def entry_sizes(self) -> Dict[str, int]:
+        with self._lock:
+            if self._mapped_ident is None or self._is_stale():
+                self._map()
+            return {key.hex(): length + _RECORD.size for key, (_, length) in self._index.items()}
+
+    def disk_size(self) -> int:
+        try:
+            return os.path.getsize(self.pack_path)
+        except OSError:
+            return 0
+
+    def _open_locked(self):
+        while True:
+            fd = os.open(self.pack_path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+            try:
+                _lock_fd(fd)
+                if os.fstat(fd).st_ino == os.stat(self.pack_path).st_ino or os.name == 'nt':
+                    return fd
+                _unlock_fd(fd)
+            except OSError:
+                os.close(fd)
+                raise
+            os.close(fd)
+
+    def _commit(self, f, index: Dict[bytes, Tuple[int, int]], slot, active_slot: int, durable: bool = True):
+        f.seek(0, os.SEEK_END)
+        index_offset = f.tell()
+        index_block = b''.join(_INDEX_ENTRY.pack(key, offset, length) for key, (offset, length) in index.items())
+        f.write(index_block)
+        f.flush()
+        if durable:
+            os.fsync(f.fileno())
+
+        seq = slot[0] + 1 if slot else 1
+        target_slot = 1 - active_slot if slot else 0
+        f.seek(8 + target_slot * _SLOT_SIZE)
+        f.write(_encode_slot(seq, index_offset, len(index_block), zlib.crc32(index_block)))
+        f.flush()
+        if durable:
+            os.fsync(f.fileno())
+        return index_offset + len(index_block)
+
+    def _load_locked(self, fd: int):
+        slot, active_slot, index = None, 0, {}
+        if os.fstat(fd).st_size >= _HEADER_SIZE:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as current:
+                slot, active_slot = self._read_committed(current)
+                index = self._parse_index(current, slot)
+        return slot, active_slot, index
+
+    def write_batch(self, items: Iterable[Tuple[str, bytes]], fsync: str = CACHE_FSYNC_MODE):
+        durable = fsync in ('batch', 'file')
+        items = list(items)
+        if not items:
+            return
+
+        with self._lock:
+            fd = self._open_locked()
+            try:
+                slot, active_slot, index = self._load_locked(fd)
+
+                with os.fdopen(fd, 'r+b', closefd=False) as f:
+                    if slot is None:
+                        f.truncate(0)
+                        f.write(_EMPTY_HEADER)
+                    f.seek(0, os.SEEK_END)
+
+                    for key, data in items:
+                        key_bytes = self._key_bytes(key)
+                        f.write(_RECORD.pack(key_bytes, len(data)))
+                        index[key_bytes] = (f.tell(), len(data))
+                        f.write(data)
+                        self.accessed.add(key)
+                        self.bytes_written += len(data) + _RECORD.size
+
+                    file_size = self._commit(f, index, slot, active_slot, durable)
+                self._unsynced = self._unsynced or fsync == 'exit'
+
+                live_bytes = sum(length + _RECORD.size for _, length in index.values())
+                dead_bytes = file_size - _HEADER_SIZE - live_bytes - len(index) * _INDEX_ENTRY.size
+                if dead_bytes > max(PACK_COMPACT_MIN_BYTES, live_bytes):
+                    self._compact(fd, index, durable)
+            except OSError as e:
+                logger.warning(f"Pack write failed for {self.pack_path}: {e}")
+            finally:
+                try:
+                    _unlock_fd(fd)
+                except OSError:
+                    pass
+                os.close(fd)
+            self._map()
+
+    def delete_batch(self, keys: Iterable[str]) -> int:
+        doomed = {self._key_bytes(key) for key in keys}
+        with self._lock:
+            if not os.path.exists(self.pack_path):
+                return 0
+            fd = self._open_locked()
+            removed = 0
+            try:
+                slot, active_slot, index = self._load_locked(fd)
+                for key_bytes in doomed & index.keys():
+                    del index[key_bytes]
+                    removed += 1
+                if removed:
+                    with os.fdopen(fd, 'r+b', closefd=False) as f:
+                        self._commit(f, index, slot, active_slot)
+                    self._compact(fd, index)
+            except OSError as e:
+                logger.warning(f"Pack delete failed for {self.pack_path}: {e}")
+            finally:
+                try:
+                    _unlock_fd(fd)
+                except OSError:
+                    pass
+                os.close(fd)
+            self._map()
+        self.accessed.difference_update(key.hex() for key in doomed)
+        return removed
+
+    def _compact(self, fd: int, index: Dict[bytes, Tuple[int, int]], durable: bool = True):
+        tmp_path = track_temp_file(self.pack_path + '.tmp')
+        self._release_map()
+        try:
+            with os.fdopen(fd, 'rb', closefd=False) as src, open(tmp_path, 'w+b') as dst:
+                dst.write(_EMPTY_HEADER)
+                compacted = {}
+                for key, (offset, length) in sorted(index.items(), key=lambda item: item[1][0]):
+                    src.seek(offset)
+                    data = src.read(length)
+                    dst.write(_RECORD.pack(key, length))
+                    compacted[key] = (dst.tell(), length)
+                    dst.write(data)
+                self._commit(dst, compacted, None, 0, durable)
+            os.replace(tmp_path, self.pack_path)
+            untrack_temp_file(tmp_path)
+            logger.debug(f"Compacted {self.pack_path} to {len(compacted)} live entries")
+        except OSError as e:
+            logger.debug(f"Pack compaction skipped for {self.pack_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            untrack_temp_file(tmp_path)
+
+    def sync(self):
+        with self._lock:
+            if not self._unsynced:
+                return
+            self._unsynced = False
+            fd = os.open(self.pack_path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def close(self):
+        with self._lock:
+            self._release_map()
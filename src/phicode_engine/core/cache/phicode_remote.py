@@ -0,0 +1,85 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Iterable, Optional, Tuple
+from ..phicode_logger import logger
+from .phicode_store import FileStore
+from ...config.config import (CACHE_FILE_TYPE, REMOTE_CACHE_URL, REMOTE_CACHE_TIMEOUT, REMOTE_CACHE_TOKEN,
+                              REMOTE_CACHE_RETRY_AFTER)
+
+class HttpRemoteCache:
+    def __init__(self, url: str, timeout: float = REMOTE_CACHE_TIMEOUT, token: str = REMOTE_CACHE_TOKEN):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.token = token
+        self._down_until = 0.0
+
+    def _request(self, key: str, method: str = 'GET', data: Optional[bytes] = None):
+        request = urllib.request.Request(f"{self.url}/cache/{sys.implementation.cache_tag}/{key}",
+                                         data=data, method=method)
+        if self.token:
+            request.add_header('Authorization', f"Bearer {self.token}")
+        if data is not None:
+            request.add_header('Content-Type', 'application/octet-stream')
+        return urllib.request.urlopen(request, timeout=self.timeout)
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, action: str, error: Exception):
+        self._down_until = time.monotonic() + REMOTE_CACHE_RETRY_AFTER
+        logger.warning(f"Remote cache {self.url} {action} failed ({error}), "
+                       f"compiling locally for the next {REMOTE_CACHE_RETRY_AFTER:.0f}s")
+
+    def read(self, key: str) -> Optional[bytes]:
+        if not self._available():
+            return None
+        try:
+            with self._request(key) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                self._mark_down("fetch", e)
+            return None
+        except (OSError, ValueError) as e:
+            self._mark_down("fetch", e)
+            return None
+
+    def write_batch(self, items: Iterable[Tuple[str, bytes]], fsync: str = 'none'):
+        for key, data in items:
+            if not self._available():
+                return
+            try:
+                with self._request(key, 'PUT', bytes(data)):
+                    pass
+            except (OSError, ValueError) as e:
+                self._mark_down("upload", e)
+
+    def sync(self):
+        pass
+
+    def close(self):
+        pass
+
+def open_remote_cache(location: str):
+    if location.startswith(('http://', 'https://')):
+        return HttpRemoteCache(location)
+    if location.startswith('file://'):
+        location = location[len('file://'):]
+    return FileStore(os.path.join(os.path.abspath(os.path.expanduser(location)), sys.implementation.cache_tag),
+                     CACHE_FILE_TYPE)
+
+_remote = None
+
+def get_remote_cache():
+    global _remote
+    if not REMOTE_CACHE_URL:
+        return None
+    if _remote is None:
+        _remote = open_remote_cache(REMOTE_CACHE_URL)
+    return _remote
@@ -0,0 +1,226 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+import zlib
+from threading import Lock
+from typing import Optional, Tuple
+from ..phicode_logger import logger
+from .phicode_pack import _lock_fd, _unlock_fd
+from .phicode_store import get_cache_root
+from .phicode_cache_stats import _stats
+from ..transpilation.phicode_to_python import get_symbol_fingerprint
+from ...config.config import SHARED_CACHE_ENABLED, SHARED_CACHE_BYTES, SHARED_CACHE_NAME, SHARED_FILE_TYPE
+
+# Header: magic | format | slot count | generation (odd while resetting) | data tail | data start | capacity
+_SHARED_MAGIC = b'PHSH'
+_SHARED_FORMAT = 1
+_HEADER = struct.Struct('<4sII')
+_U64 = struct.Struct('<Q')
+_GENERATION_OFFSET = 16
+_TAIL_OFFSET = 24
+_GEOMETRY = struct.Struct('<QQ')
+_GEOMETRY_OFFSET = 32
+_HEADER_SIZE = 64
+# Slot: key | data offset | data length | data crc | slot crc
+_SLOT = struct.Struct('<8sQII')
+_SLOT_SIZE = 32
+_SLOT_CRC = struct.Struct('<I')
+_EMPTY_KEY = b'\0' * 8
+_MAX_PROBE = 16
+_BYTES_PER_SLOT = 4096
+
+KIND_TEXT = 1
+KIND_CODE = 2
+
+def _read_at(fd: int, length: int, offset: int) -> bytes:
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+def _write_at(fd: int, data: bytes, offset: int):
+    os.lseek(fd, offset, os.SEEK_SET)
+    os.write(fd, data)
+
+def _slot_key(kind: int, key: str) -> bytes:
+    namespace = f"{get_symbol_fingerprint()}:{sys.implementation.cache_tag}:{key}".encode('utf-8')
+    return bytes([kind]) + hashlib.blake2b(namespace, digest_size=7).digest()
+
+class SharedCache:
+    def __init__(self, path: str, size: int = SHARED_CACHE_BYTES):
+        self.path = path
+        self.size = max(size, 1024 * 1024)
+        self._lock = Lock()
+        self._mm = None
+        self._fd = None
+        self._pid = None
+        self._slot_count = 0
+        self._data_start = 0
+        self._capacity = 0
+
+    def _open(self) -> bool:
+        if self._pid == os.getpid():
+            return self._mm is not None
+        self._pid = os.getpid()
+        self._mm = None
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+            _lock_fd(self._fd)
+            try:
+                self._initialize()
+            finally:
+                _unlock_fd(self._fd)
+            self._mm = mmap.mmap(self._fd, self._capacity)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Shared cache unavailable at {self.path}: {e}")
+            self._mm = None
+            return False
+        return True
+
+    def _initialize(self):
+        file_size = os.fstat(self._fd).st_size
+        header = _read_at(self._fd, _HEADER_SIZE, 0) if file_size >= _HEADER_SIZE else b''
+        if len(header) == _HEADER_SIZE:
+            magic, fmt, slot_count = _HEADER.unpack_from(header)
+            data_start, capacity = _GEOMETRY.unpack_from(header, _GEOMETRY_OFFSET)
+            if magic == _SHARED_MAGIC and fmt == _SHARED_FORMAT and capacity <= file_size:
+                self._slot_count, self._data_start, self._capacity = slot_count, data_start, capacity
+                return
+
+        capacity = max(self.size, file_size)
+        slot_count = max(1024, capacity // _BYTES_PER_SLOT)
+        data_start = _HEADER_SIZE + slot_count * _SLOT_SIZE
+        if file_size < capacity:
+            os.ftruncate(self._fd, capacity)
+        _write_at(self._fd, b'\0' * (data_start - _HEADER_SIZE), _HEADER_SIZE)
+        header = bytearray(_HEADER_SIZE)
+        _HEADER.pack_into(header, 0, _SHARED_MAGIC, _SHARED_FORMAT, slot_count)
+        _U64.pack_into(header, _TAIL_OFFSET, data_start)
+        _GEOMETRY.pack_into(header, _GEOMETRY_OFFSET, data_start, capacity)
+        _write_at(self._fd, bytes(header), 0)
+        self._slot_count, self._data_start, self._capacity = slot_count, data_start, capacity
+
+    def _probe(self, key_bytes: bytes):
+        start = int.from_bytes(key_bytes, 'little') % self._slot_count
+        for i in range(_MAX_PROBE):
+            yield _HEADER_SIZE + ((start + i) % self._slot_count) * _SLOT_SIZE
+
+    def _read_slot(self, mm, position: int) -> Optional[Tuple[bytes, int, int, int]]:
+        slot = _SLOT.unpack_from(mm, position)
+        if zlib.crc32(mm[position:position + _SLOT.size]) != _SLOT_CRC.unpack_from(mm, position + _SLOT.size)[0]:
+            return None
+        return slot
+
+    def _get(self, key_bytes: bytes, decode):
+        value = self._lookup(key_bytes, decode)
+        if value is None:
+            _stats.miss('shared')
+        else:
+            _stats.hit('shared')
+        return value
+
+    def _lookup(self, key_bytes: bytes, decode):
+        if not self._open():
+            return None
+        mm = self._mm
+        generation = _U64.unpack_from(mm, _GENERATION_OFFSET)[0]
+        if generation & 1:
+            return None
+
+        for position in self._probe(key_bytes):
+            if mm[position:position + 8] == _EMPTY_KEY:
+                return None
+            slot = self._read_slot(mm, position)
+            if slot is None or slot[0] != key_bytes:
+                continue
+            _, offset, length, data_crc = slot
+            if offset < self._data_start or offset + length > self._capacity:
+                return None
+            try:
+                with memoryview(mm)[offset:offset + length] as view:
+                    if zlib.crc32(view, zlib.crc32(key_bytes)) != data_crc:
+                        return None
+                    value = decode(view)
+            except (EOFError, ValueError, TypeError, UnicodeDecodeError):
+                return None
+            if _U64.unpack_from(mm, _GENERATION_OFFSET)[0] != generation:
+                return None
+            return value
+        return None
+
+    def _reset(self, mm):
+        generation = _U64.unpack_from(mm, _GENERATION_OFFSET)[0]
+        _U64.pack_into(mm, _GENERATION_OFFSET, generation | 1)
+        mm[_HEADER_SIZE:self._data_start] = bytes(self._data_start - _HEADER_SIZE)
+        _U64.pack_into(mm, _TAIL_OFFSET, self._data_start)
+        _U64.pack_into(mm, _GENERATION_OFFSET, (generation | 1) + 1)
+        logger.debug(f"Shared cache {self.path} full, reset to generation {(generation | 1) + 1}")
+
+    def _free_slot(self, mm, key_bytes: bytes) -> Tuple[Optional[int], bool]:
+        for position in self._probe(key_bytes):
+            if mm[position:position + 8] == _EMPTY_KEY:
+                return position, False
+            slot = self._read_slot(mm, position)
+            if slot is None:
+                return position, False
+            if slot[0] == key_bytes:
+                return position, True
+        return None, False
+
+    def _put(self, key_bytes: bytes, data):
+        if not self._open() or len(data) > self._capacity - self._data_start:
+            return
+        with self._lock:
+            mm = self._mm
+            _lock_fd(self._fd)
+            try:
+                if _U64.unpack_from(mm, _GENERATION_OFFSET)[0] & 1:
+                    self._reset(mm)
+                position, exists = self._free_slot(mm, key_bytes)
+                if exists:
+                    return
+                tail = _U64.unpack_from(mm, _TAIL_OFFSET)[0]
+                if position is None or tail + len(data) > self._capacity:
+                    self._reset(mm)
+                    tail = self._data_start
+                    position, _ = self._free_slot(mm, key_bytes)
+
+                mm[tail:tail + len(data)] = data
+                _U64.pack_into(mm, _TAIL_OFFSET, (tail + len(data) + 7) & ~7)
+                slot = _SLOT.pack(key_bytes, tail, len(data), zlib.crc32(data, zlib.crc32(key_bytes)))
+                mm[position + _SLOT.size:position + _SLOT_SIZE] = _SLOT_CRC.pack(zlib.crc32(slot)) + b'\0' * 4
+                mm[position:position + _SLOT.size] = slot
+            finally:
+                _unlock_fd(self._fd)
+
+    def get_text(self, key: str) -> Optional[str]:
+        return self._get(_slot_key(KIND_TEXT, key), lambda view: str(view, 'utf-8'))
+
+    def put_text(self, key: str, text: str):
+        self._put(_slot_key(KIND_TEXT, key), text.encode('utf-8'))
+
+    def get_code(self, key: str):
+        return self._get(_slot_key(KIND_CODE, key), marshal.loads)
+
+    def put_code(self, key: str, code):
+        self._put(_slot_key(KIND_CODE, key), marshal.dumps(code))
+
+    def usage(self) -> Tuple[int, int]:
+        if not self._open():
+            return 0, 0
+        return _U64.unpack_from(self._mm, _TAIL_OFFSET)[0] - self._data_start, self._capacity - self._data_start
+
+_shared = None
+
+def get_shared_cache() -> Optional[SharedCache]:
+    global _shared
+    if not SHARED_CACHE_ENABLED:
+        return None
+    if _shared is None:
+        _shared = SharedCache(os.path.join(get_cache_root(), SHARED_CACHE_NAME + SHARED_FILE_TYPE))
+    return _shared
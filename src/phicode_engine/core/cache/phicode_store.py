@@ -0,0 +1,170 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import os
+from threading import Lock
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from ..phicode_logger import logger
+from .phicode_pack import PackStore
+from .phicode_temp_files import track_temp_file, untrack_temp_file
+from ...config.config import CACHE_PATH, CACHE_BACKEND, PACK_FILE_TYPE, CACHE_FSYNC_MODE
+
+def _fsync_directory(directory: str):
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class FileStore:
+    def __init__(self, directory: str, file_type: str):
+        self.directory = directory
+        self.file_type = file_type
+        self._ready_dirs = set()
+        self._unsynced = set()
+        self.accessed = set()
+        self.sources = {}
+        self.bytes_written = 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:4], key + self.file_type)
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path_for(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        self.accessed.add(key)
+        return data
+
+    def _scan(self) -> Iterator[os.DirEntry]:
+        try:
+            for outer in os.scandir(self.directory):
+                if not outer.is_dir():
+                    continue
+                for inner in os.scandir(outer.path):
+                    if inner.is_dir():
+                        yield from (entry for entry in os.scandir(inner.path) if entry.name.endswith(self.file_type))
+        except OSError:
+            return
+
+    def keys(self) -> Iterable[str]:
+        return [entry.name[:-len(self.file_type)] for entry in self._scan()]
+
+    def entry_sizes(self) -> Dict[str, int]:
+        sizes = {}
+        for entry in self._scan():
+            try:
+                sizes[entry.name[:-len(self.file_type)]] = entry.stat().st_size
+            except OSError:
+                pass
+        return sizes
+
+    def disk_size(self) -> int:
+        return sum(self.entry_sizes().values())
+
+    def _ensure_dir(self, directory: str):
+        if directory not in self._ready_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ready_dirs.add(directory)
+
+    def write_batch(self, items: Iterable[Tuple[str, bytes]], fsync: str = CACHE_FSYNC_MODE):
+        written_files = []
+        try:
+            for key, data in items:
+                target_path = self.path_for(key)
+                self._ensure_dir(os.path.dirname(target_path))
+                tmp_path = track_temp_file(f"{target_path}.{os.getpid()}.tmp")
+                with open(tmp_path, 'wb', buffering=64*1024) as f:
+                    f.write(data)
+                    f.flush()
+                    if fsync == 'file':
+                        os.fsync(f.fileno())
+                    written_files.append((tmp_path, target_path))
+                self.accessed.add(key)
+                self.bytes_written += len(data)
+
+            if fsync == 'batch':
+                for tmp_path, _ in written_files:
+                    try:
+                        with open(tmp_path, 'r+b') as f:
+                            os.fsync(f.fileno())
+                    except OSError as e:
+                        logger.warning(f"Sync failed for {tmp_path}: {e}")
+
+            for tmp_path, target_path in written_files:
+                os.replace(tmp_path, target_path)
+                untrack_temp_file(tmp_path)
+
+            if fsync == 'exit':
+                self._unsynced.update(target_path for _, target_path in written_files)
+            elif fsync != 'none':
+                for directory in {os.path.dirname(target_path) for _, target_path in written_files}:
+                    _fsync_directory(directory)
+
+        except OSError as e:
+            logger.warning(f"Batch cache write failed: {e}")
+            for tmp_path, _ in written_files:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                untrack_temp_file(tmp_path)
+
+    def delete_batch(self, keys: Iterable[str]) -> int:
+        removed = 0
+        for key in keys:
+            try:
+                os.remove(self.path_for(key))
+                removed += 1
+            except OSError:
+                pass
+            self.accessed.discard(key)
+        return removed
+
+    def sync(self):
+        paths, self._unsynced = self._unsynced, set()
+        for path in paths:
+            try:
+                with open(path, 'r+b') as f:
+                    os.fsync(f.fileno())
+            except OSError as e:
+                logger.warning(f"Sync failed for {path}: {e}")
+        for directory in {os.path.dirname(path) for path in paths}:
+            _fsync_directory(directory)
+
+    def close(self):
+        pass
+
+_stores = {}
+_stores_lock = Lock()
+_cache_root = None
+
+def get_cache_root() -> str:
+    global _cache_root
+    if _cache_root is None:
+        _cache_root = os.path.join(os.getcwd(), CACHE_PATH)
+    return _cache_root
+
+def _create_store(name: str, file_type: str):
+    root = get_cache_root()
+    if CACHE_BACKEND == 'pack':
+        try:
+            os.makedirs(root, exist_ok=True)
+            return PackStore(os.path.join(root, name + PACK_FILE_TYPE))
+        except OSError as e:
+            logger.debug(f"Pack store unavailable for {name}, using per-file layout: {e}")
+    return FileStore(os.path.join(root, name), file_type)
+
+def open_store(name: str, file_type: str):
+    store = _stores.get(name)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(name)
+            if store is None:
+                store = _create_store(name, file_type)
+                _stores[name] = store
+    return store
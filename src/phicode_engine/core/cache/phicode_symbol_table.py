@@ -0,0 +1,78 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import hashlib
+import marshal
+import os
+from functools import lru_cache
+from typing import Optional
+from ..phicode_logger import logger
+from .phicode_frozen import is_frozen
+from .phicode_store import get_cache_root
+from .phicode_temp_files import track_temp_file, untrack_temp_file
+from ..transpilation.phicode_to_python import get_symbol_table, install_symbol_table
+from ...config.config import (PHICODE_VERSION, CUSTOM_FOLDER_PATH, CUSTOM_FOLDER_PATH_2, VALIDATION_ENABLED,
+                              STRICT_VALIDATION, SYMBOL_TABLE_NAME, SYMBOL_TABLE_FILE_TYPE)
+
+_SYMBOL_TABLE_FORMAT = 1
+_FIELDS = ('mappings', 'fingerprint', 'trie', 'table', 'ascii')
+_primed = False
+
+def symbol_table_path() -> str:
+    return os.path.join(get_cache_root(), SYMBOL_TABLE_NAME + SYMBOL_TABLE_FILE_TYPE)
+
+@lru_cache(maxsize=1)
+def config_fingerprint() -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{PHICODE_VERSION}\0{_SYMBOL_TABLE_FORMAT}\0{VALIDATION_ENABLED}\0{STRICT_VALIDATION}".encode('utf-8'))
+    for config_path in (CUSTOM_FOLDER_PATH, CUSTOM_FOLDER_PATH_2):
+        try:
+            with open(config_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            h.update(b'\0-')
+            continue
+        h.update(b'\0+' + len(data).to_bytes(8, 'little') + data)
+    return h.digest()
+
+def load_symbol_table() -> Optional[dict]:
+    try:
+        with open(symbol_table_path(), 'rb') as f:
+            table = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (not isinstance(table, dict) or table.get('key') != config_fingerprint() or
+            not all(field in table for field in _FIELDS) or not isinstance(table['mappings'], dict)):
+        return None
+    return table
+
+def store_symbol_table(table: dict):
+    if is_frozen():
+        return
+    path = symbol_table_path()
+    data = marshal.dumps(dict({field: table[field] for field in _FIELDS}, key=config_fingerprint()))
+    tmp_path = track_temp_file(f"{path}.{os.getpid()}.tmp")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Symbol table not persisted: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    finally:
+        untrack_temp_file(tmp_path)
+
+def prime_symbol_table():
+    global _primed
+    if _primed:
+        return
+    _primed = True
+    table = load_symbol_table()
+    if table is None:
+        store_symbol_table(get_symbol_table())
+    else:
+        install_symbol_table(table)
@@ -0,0 +1,23 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+from threading import Lock
+from typing import List
+
+_temp_files = set()
+_temp_lock = Lock()
+
+def track_temp_file(path: str) -> str:
+    with _temp_lock:
+        _temp_files.add(path)
+    return path
+
+def untrack_temp_file(path: str):
+    with _temp_lock:
+        _temp_files.discard(path)
+
+def tracked_temp_files() -> List[str]:
+    with _temp_lock:
+        paths = list(_temp_files)
+        _temp_files.clear()
+    return paths
@@ -16,16 +16,16 @@ def install_project_wide_importer(project_root: str = None, recursive: bool = Tr
 
     return phi_directories
 
-def discover_phi_directories(root_path: str, recursive: bool = True) -> list:
+def discover_phi_directories(root_path: str, recursive: bool = True, extensions: tuple = (MAIN_FILE_TYPE,)) -> list:
     phi_dirs = set()
 
     if recursive:
         for root, dirs, files in os.walk(root_path):
-            if any(f.endswith(MAIN_FILE_TYPE) for f in files):
+            if any(f.endswith(extensions) for f in files):
                 phi_dirs.add(root)
     else:
         try:
-            if any(entry.is_file() and entry.name.endswith(MAIN_FILE_TYPE)
+            if any(entry.is_file() and entry.name.endswith(extensions)
                 for entry in os.scandir(root_path)):
                 phi_dirs.add(root_path)
         except OSError:
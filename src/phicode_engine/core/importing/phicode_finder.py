@@ -6,23 +6,75 @@ import importlib.util
 import importlib.machinery
 import os
 import sys
-from functools import lru_cache
-from typing import Optional, Tuple
+import time
+from typing import Dict, Optional, Tuple
 from ..cache.phicode_cache import _cache
-from ..runtime.phicode_loader import PhicodeLoader
-from ...config.config import MAIN_FILE_TYPE, TERTIARY_FILE_TYPE, SECONDARY_FILE_TYPE
+from ..cache.phicode_cache_stats import _stats, INVALIDATIONS
+from ..cache.phicode_frozen import is_frozen, frozen_entry
+from ..runtime.phicode_loader import PhicodeLoader, FrozenLoader
+from ...config.config import (MAIN_FILE_TYPE, TERTIARY_FILE_TYPE, SECONDARY_FILE_TYPE, NEGATIVE_CACHE_MAX_ENTRIES,
+                              MANIFEST_RACY_WINDOW)
 
 try:
     from ..runtime.phicode_loader import _flush_batch_writes
 except ImportError:
     def _flush_batch_writes(): pass
 
+_STDLIB_MODULE_NAMES = getattr(sys, 'stdlib_module_names', frozenset())
+
 class PhicodeFinder(importlib.abc.MetaPathFinder):
-    __slots__ = ('base_path', '_canon_base_path')
+    __slots__ = ('base_path', '_canon_base_path', '_misses')
 
     def __init__(self, base_path: str):
         self.base_path = os.path.abspath(base_path)
         self._canon_base_path = os.path.realpath(self.base_path)
+        self._misses: Dict[str, Tuple] = {}
+
+    def _directory_signature(self, fullname: str) -> Optional[Tuple]:
+        package_dir = os.path.join(self._canon_base_path, *fullname.split('.'))
+        directory = package_dir
+        mtime_ns = self._stat_mtime(directory)
+        while mtime_ns is None:
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+            mtime_ns = self._stat_mtime(directory)
+        signature = ((directory, mtime_ns),)
+        if directory == package_dir:
+            parent = os.path.dirname(directory)
+            signature += ((parent, self._stat_mtime(parent)),)
+        return signature
+
+    def _is_known_miss(self, fullname: str) -> bool:
+        signature = self._misses.get(fullname)
+        if signature is None:
+            return False
+        if all(self._stat_mtime(directory) == mtime_ns for directory, mtime_ns in signature):
+            _stats.hit('negative')
+            return True
+        del self._misses[fullname]
+        _stats.add('negative', INVALIDATIONS)
+        return False
+
+    @staticmethod
+    def _stat_mtime(directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _record_miss(self, fullname: str):
+        _stats.miss('negative')
+        signature = self._directory_signature(fullname)
+        if signature is None:
+            return
+        racy_after = time.time_ns() - int(MANIFEST_RACY_WINDOW * 1e9)
+        if any(mtime_ns > racy_after for _, mtime_ns in signature):
+            return
+        if len(self._misses) >= NEGATIVE_CACHE_MAX_ENTRIES:
+            self._misses.clear()
+        self._misses[fullname] = signature
 
     def _is_stdlib_module(self, fullname: str) -> bool:
         if fullname in sys.builtin_module_names:
@@ -38,7 +90,6 @@ class PhicodeFinder(importlib.abc.MetaPathFinder):
             pass
         return False
 
-    @lru_cache(maxsize=256)
     def _get_file_path(self, fullname: str) -> Optional[str]:
         parts = fullname.split('.')
         base = os.path.join(self._canon_base_path, *parts)
@@ -51,7 +102,6 @@ class PhicodeFinder(importlib.abc.MetaPathFinder):
                 continue
         return None
 
-    @lru_cache(maxsize=256)
     def _get_package_paths(self, fullname: str) -> Optional[Tuple[str, str]]:
         parts = fullname.split('.')
         package_dir = os.path.join(self._canon_base_path, *parts)
@@ -61,8 +111,31 @@ class PhicodeFinder(importlib.abc.MetaPathFinder):
                 return package_dir, init_file
         return None
 
+    def _find_frozen(self, fullname: str):
+        top_level = fullname.partition('.')[0]
+        if top_level in sys.builtin_module_names or top_level in _STDLIB_MODULE_NAMES:
+            return None
+        base = os.path.join(self._canon_base_path, *fullname.split('.'))
+        for ext in (MAIN_FILE_TYPE, TERTIARY_FILE_TYPE):
+            entry = frozen_entry(base + ext)
+            if entry is not None:
+                return importlib.util.spec_from_file_location(
+                    fullname, base + ext, loader=FrozenLoader(base + ext, *entry))
+        for ext in (MAIN_FILE_TYPE, TERTIARY_FILE_TYPE):
+            init_file = os.path.join(base, '__init__' + ext)
+            entry = frozen_entry(init_file)
+            if entry is not None:
+                return importlib.util.spec_from_file_location(
+                    fullname, init_file, loader=FrozenLoader(init_file, *entry), submodule_search_locations=[base])
+        return None
+
     def find_spec(self, fullname: str, path, target=None):
+        if is_frozen():
+            return self._find_frozen(fullname)
+        if self._is_known_miss(fullname):
+            return None
         if self._is_stdlib_module(fullname):
+            self._record_miss(fullname)
             return None
 
         cache_key = (fullname, self._canon_base_path)
@@ -75,6 +148,7 @@ class PhicodeFinder(importlib.abc.MetaPathFinder):
                     return spec
             except OSError:
                 _cache.set_spec(cache_key, None)
+            _stats.add('spec', INVALIDATIONS)
 
         filename = self._get_file_path(fullname)
         if filename:
@@ -102,6 +176,7 @@ class PhicodeFinder(importlib.abc.MetaPathFinder):
                 pass
             return spec
 
+        self._record_miss(fullname)
         return None
 
     def __del__(self):
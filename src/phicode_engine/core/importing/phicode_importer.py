@@ -4,9 +4,11 @@
 import sys
 import os
 from .phicode_finder import PhicodeFinder
+from ..cache.phicode_symbol_table import prime_symbol_table
 
 def install_phicode_importer(base_path: str):
     base_path = os.path.abspath(base_path)
+    prime_symbol_table()
 
     for finder in sys.meta_path:
         if (isinstance(finder, PhicodeFinder) and
@@ -6,8 +6,8 @@ from typing import List, Optional
 from .phicode_cli_parser import build_parser
 from .phicode_cli_handlers import (
     handle_security_install, handle_security_status,
-    handle_benchmark, handle_api_server,
-    handle_config_generate, handle_config_reset
+    handle_benchmark, handle_api_server, handle_compile_all, handle_cache_gc,
+    handle_config_generate, handle_config_reset, handle_calibrate
 )
 from ..phicode_args import PhicodeArgs, _set_current_args, _set_switched_execution
 from ...phicode_logger import logger
@@ -41,9 +41,18 @@ def parse_args(argv: Optional[List[str]] = None) -> PhicodeArgs:
     if "--benchmark" in argv:
         handle_benchmark(argv)
 
+    if "--calibrate" in argv:
+        handle_calibrate()
+
     if "--api-server" in argv:
         handle_api_server(argv)
 
+    if "--compile-all" in argv:
+        handle_compile_all(argv)
+
+    if "--cache-gc" in argv:
+        handle_cache_gc()
+
     if "--config-generate" in argv:
         handle_config_generate()
 
@@ -86,6 +95,9 @@ def parse_args(argv: Optional[List[str]] = None) -> PhicodeArgs:
         list_interpreters=parsed.list_interpreters,
         show_versions=parsed.show_versions,
         version=parsed.version,
+        cache_memory=parsed.cache_memory,
+        cache_stats=parsed.cache_stats,
+        frozen=parsed.frozen,
     )
 
     _set_current_args(args)
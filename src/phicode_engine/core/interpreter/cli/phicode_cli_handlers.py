@@ -52,6 +52,10 @@ def handle_benchmark(argv):
         logger.error("Benchsuite module not available")
     sys.exit(0)
 
+def handle_calibrate():
+    from ....rust.phirust_calibrate import run_calibration
+    sys.exit(run_calibration())
+
 def handle_api_server(argv):
     try:
         port_idx = argv.index("--api-port") + 1 if "--api-port" in argv else None
@@ -64,6 +68,22 @@ def handle_api_server(argv):
     api_main()
     sys.exit(0)
 
+def handle_compile_all(argv):
+    idx = argv.index("--compile-all") + 1
+    root_path = argv[idx] if idx < len(argv) and not argv[idx].startswith("-") else "."
+    try:
+        jobs = int(argv[argv.index("--jobs") + 1]) if "--jobs" in argv else None
+    except (ValueError, IndexError):
+        jobs = None
+
+    from ...cache.phicode_compile_all import compile_all
+    sys.exit(compile_all(root_path, incremental="--incremental" in argv, jobs=jobs))
+
+def handle_cache_gc():
+    from ...cache.phicode_cache_gc import log_collect
+    log_collect()
+    sys.exit(0)
+
 def handle_config_generate():
     from ...mod.phicode_config_generator import generate_default_config
     generate_default_config()
@@ -24,6 +24,18 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--security-status", action="store_true", help="Check security binary status")
 
     parser.add_argument("--benchmark", action="store_true", help="Engine Benchmark suite")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Measure the Rust and process pool transpile crossovers on this host and save them to the engine config")
+    parser.add_argument("--cache-memory", action="store_true", help="Log per-layer cache memory usage at exit")
+    parser.add_argument("--cache-stats", action="store_true", help="Log cache hit/miss telemetry at exit")
+    parser.add_argument("--compile-all", nargs="?", const=".", metavar="PATH",
+                        help="Precompile every φ source under PATH into the cache of the current directory")
+    parser.add_argument("--cache-gc", action="store_true",
+                        help="Remove orphaned and stale cache entries and enforce PHICODE_CACHE_DISK_MB")
+    parser.add_argument("--frozen", action="store_true",
+                        help="Run only from bytecode prebuilt by --compile-all; never read sources or write the cache")
+    parser.add_argument("--incremental", action="store_true", help="With --compile-all, skip sources whose cache is valid")
+    parser.add_argument("--jobs", type=int, help="Worker processes for --compile-all (default: all cores)")
 
     parser.add_argument("--phiemon", help=f"Start as {DAEMON_TOOL} process")
     parser.add_argument("--phiemon-status", action="store_true", help=f"Show {DAEMON_TOOL} status")
@@ -26,6 +26,9 @@ class PhicodeArgs:
     show_versions: bool = False
     version: bool = False
     benchmark: bool = False
+    cache_memory: bool = False
+    cache_stats: bool = False
+    frozen: bool = False
     _original_argv: List[str] = field(default_factory=list)
 
     def __post_init__(self):
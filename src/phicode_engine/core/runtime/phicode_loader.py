@@ -3,9 +3,11 @@
 # Commercial use requires a paid license. See link for details.
 import importlib.abc
 import os
+import sys
 from ..cache.phicode_cache import _cache
 from ..phicode_logger import logger
 from ..cache.phicode_bytecode import BytecodeManager
+from ..cache.phicode_manifest import _manifest
 from ..interpreter.phicode_executor import ModuleExecutor
 from ..interpreter.phicode_switch import InterpreterSwitcher
 from ...config.config import ENGINE, IMPORT_ANALYSIS_ENABLED
@@ -25,17 +27,33 @@ class PhicodeLoader(importlib.abc.Loader):
 
     def exec_module(self, module):
         global _switch_executed, _original_module_name
-        phicode_source = _cache.get_source(self.path)
-        if phicode_source is None:
-            logger.error(f"Failed to read: {self.path}")
-            raise ImportError(f"Cannot read {self.path}")
+        stat_key = _manifest.stat_key(_cache._canonicalize_path(self.path))
+        entry = _manifest.lookup(stat_key)
+
+        context = None
+        code = None
+        if entry is None:
+            context = self._load_context()
+            if not IMPORT_ANALYSIS_ENABLED:
+                code = BytecodeManager.load_cached(self.path, context.digest)
 
         try:
-            python_source = _cache.get_python_source(self.path, phicode_source)
+            if entry is not None:
+                python_source = entry.python_source
+                optimal_interpreter = entry.interpreter_hint
+            elif code is not None:
+                python_source = None
+                optimal_interpreter = sys.executable
+            else:
+                try:
+                    python_source = _cache.get_module_python_source(context)
+                except UnicodeDecodeError as e:
+                    logger.error(f"Encoding error {self.path}: {e}")
+                    raise ImportError(f"Cannot decode {self.path}") from e
+                optimal_interpreter = _cache.get_module_interpreter_hint(context)
 
             if IMPORT_ANALYSIS_ENABLED and not _switch_executed:
-                optimal_interpreter = _cache.get_interpreter_hint(self.path, phicode_source)
-                if optimal_interpreter != __import__('sys').executable:
+                if optimal_interpreter != sys.executable:
                     _original_module_name = os.path.abspath(self.path)
                     _switch_executed = True
                     if InterpreterSwitcher.attempt_switch(optimal_interpreter, _original_module_name):
@@ -45,12 +63,44 @@ class PhicodeLoader(importlib.abc.Loader):
             should_be_main = (module_name == (_original_module_name or _main_module_name) and
                             (_original_module_name or _main_module_name) is not None)
 
-            code = BytecodeManager.compile_and_cache(python_source, self.path)
+            if entry is not None and entry.code is not None:
+                code = entry.code
+            elif code is None:
+                if context is not None and not IMPORT_ANALYSIS_ENABLED:
+                    code = BytecodeManager.compile_and_store(python_source, self.path, context.digest)
+                else:
+                    context = context or self._load_context()
+                    code = BytecodeManager.compile_and_cache(python_source, self.path, context.digest)
+            if entry is None:
+                _manifest.record(stat_key, python_source, optimal_interpreter, code)
             ModuleExecutor.execute_module(module, code, should_be_main)
 
         except SyntaxError as e:
             logger.error(f"Syntax error in {self.path} at line {e.lineno}: {e.msg}")
             raise SyntaxError(f"{ENGINE} syntax error in {self.path}: {e}") from e
 
+    def _load_context(self):
+        context = _cache.load_context(self.path)
+        if context is None:
+            logger.error(f"Failed to read: {self.path}")
+            raise ImportError(f"Cannot read {self.path}")
+        return context
+
     def _get_module_name(self):
-        return os.path.splitext(os.path.basename(self.path))[0]
\ No newline at end of file
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+class FrozenLoader(importlib.abc.Loader):
+    __slots__ = ('path', 'digest', 'key')
+
+    def __init__(self, path: str, digest: bytes, key: str):
+        self.path = path
+        self.digest = digest
+        self.key = key
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = BytecodeManager.load_frozen(self.path, self.digest, self.key)
+        should_be_main = _main_module_name is not None and getattr(module, '__name__', '') == _main_module_name
+        ModuleExecutor.execute_module(module, code, should_be_main)
@@ -11,6 +11,9 @@ from .shutdown_handler import install_shutdown_handler, register_cleanup, cleanu
 from ..interpreter.phicode_interpreter import InterpreterSelector
 from ..phicode_logger import logger
 from ..cache.phicode_bytecode import _flush_batch_writes
+from ..cache.phicode_cache_report import log_memory_report, log_stats_report
+from ..cache.phicode_cache_gc import update_ledger
+from ..cache.phicode_frozen import FrozenCacheError, is_frozen, set_frozen, frozen_modules, frozen_entry
 from ..interpreter.phicode_args import PhicodeArgs, _argv_context
 from ...config.config import STARTUP_WARNING_MS, ENGINE_NAME, MAIN_FILE_TYPE, SECONDARY_FILE_TYPE, TERTIARY_FILE_TYPE
 
@@ -21,11 +24,34 @@ def run(args: PhicodeArgs):
     if not is_switched:
         _show_interpreter_recommendations()
 
-    install_shutdown_handler()
-    register_cleanup(cleanup_cache_temp_files)
-    register_cleanup(_flush_batch_writes)
+    if args.frozen:
+        set_frozen(True)
 
-    module_name, phicode_src_folder, is_phicode_file = _resolve_module(args.module_or_file)
+    install_shutdown_handler()
+    if is_frozen():
+        sys.dont_write_bytecode = True
+        try:
+            frozen_modules()
+        except FrozenCacheError as e:
+            logger.error(f"❄️  {e}")
+            sys.exit(2)
+    else:
+        register_cleanup(cleanup_cache_temp_files)
+        register_cleanup(update_ledger)
+        register_cleanup(_flush_batch_writes)
+    if args.cache_memory:
+        register_cleanup(log_memory_report)
+    if args.cache_stats:
+        register_cleanup(log_stats_report)
+
+    if is_frozen():
+        try:
+            module_name, phicode_src_folder, is_phicode_file = _resolve_frozen_module(args.module_or_file)
+        except FrozenCacheError as e:
+            logger.error(f"❄️  {e}")
+            sys.exit(2)
+    else:
+        module_name, phicode_src_folder, is_phicode_file = _resolve_module(args.module_or_file)
     phicode_src_folder = os.path.realpath(phicode_src_folder)
 
     if not os.path.isdir(phicode_src_folder):
@@ -85,6 +111,22 @@ def _resolve_module(module_or_file):
             logger.debug(f"Treating as module name: {module_or_file}")
             return module_or_file, cwd, False
 
+def _resolve_frozen_module(module_or_file):
+    if module_or_file.endswith((MAIN_FILE_TYPE, TERTIARY_FILE_TYPE)):
+        path = os.path.realpath(module_or_file)
+        if frozen_entry(path) is None:
+            raise FrozenCacheError(f"{module_or_file} is not in the module index; "
+                                   f"rebuild it with 'phicode --compile-all'")
+        return os.path.splitext(os.path.basename(path))[0], os.path.dirname(path), True
+    cwd = os.getcwd()
+    base = os.path.join(os.path.realpath(cwd), module_or_file)
+    if frozen_entry(base + MAIN_FILE_TYPE) is not None or frozen_entry(base + TERTIARY_FILE_TYPE) is not None:
+        return module_or_file, cwd, True
+    if not os.path.isfile(base + SECONDARY_FILE_TYPE) and not os.path.isdir(base):
+        raise FrozenCacheError(f"Module {module_or_file} is not in the module index; "
+                               f"rebuild it with 'phicode --compile-all'")
+    return module_or_file, cwd, False
+
 def _execute_module(module_name, is_phicode_file, args):
     try:
         logger.debug(f"Importing module: {module_name}")
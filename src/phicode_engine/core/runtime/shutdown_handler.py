@@ -6,7 +6,7 @@ import signal
 import atexit
 from threading import RLock
 from ..phicode_logger import logger
-from ...config.config import CACHE_PATH
+from ..cache.phicode_temp_files import tracked_temp_files
 
 class ShutdownHandler:
     __slots__ = ('_shutdown_hooks', '_lock', '_shutting_down')
@@ -60,20 +60,13 @@ def install_shutdown_handler():
     _shutdown_handler.install()
 
 def cleanup_cache_temp_files():
-    cache_dir = CACHE_PATH
-    if os.path.exists(cache_dir):
+    removed_files = 0
+    for path in tracked_temp_files():
         try:
-            logger.debug(f"Cleaning up cache dir: {cache_dir}")
-            removed_files = 0
-            for root, dirs, files in os.walk(cache_dir):
-                for file in files:
-                    if file.endswith('.tmp') or file.endswith('.lock'):
-                        try:
-                            os.remove(os.path.join(root, file))
-                            removed_files += 1
-                        except OSError as e:
-                            logger.warning(f"Failed to delete {file}: {str(e)}")
-            logger.info(f"Cleaned up {removed_files} temporary cache files")
-        except Exception as e:
-            logger.error(f"Cache cleanup failed: {str(e)}", exc_info=True)
-            pass
\ No newline at end of file
+            os.remove(path)
+            removed_files += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete {path}: {str(e)}")
+    logger.info(f"Cleaned up {removed_files} temporary cache files")
\ No newline at end of file
@@ -0,0 +1,83 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import List, Optional
+from .phicode_to_python import _transpiler
+from .symbol_scanner import iter_top_level_lines
+from ...core.phicode_logger import logger
+from ...config.config import TRANSPILE_WORKERS, PARALLEL_CHUNKS_PER_WORKER
+
+def split_top_level(source: str, parts: int) -> List[str]:
+    target = len(source) // parts
+    if parts < 2 or target == 0:
+        return [source]
+    chunks = []
+    last = 0
+    for line in iter_top_level_lines(source):
+        if line - last >= target:
+            chunks.append(source[last:line])
+            last = line
+            if len(chunks) == parts - 1:
+                break
+    chunks.append(source[last:])
+    return chunks
+
+def _scan_chunk(chunk: str) -> str:
+    return _transpiler.scan(chunk)
+
+def resolve_workers(workers: int = TRANSPILE_WORKERS) -> int:
+    cores = os.cpu_count() or 1
+    return cores if workers < 0 else min(workers, cores)
+
+class ParallelTranspiler:
+    def __init__(self, workers: int = TRANSPILE_WORKERS):
+        self.workers = resolve_workers(workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        self._executor = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def transpile(self, source: str) -> Optional[str]:
+        if self.workers < 2:
+            return None
+        chunks = split_top_level(source, self.workers * PARALLEL_CHUNKS_PER_WORKER)
+        if len(chunks) < 2:
+            return None
+        try:
+            return ''.join(self._get_executor().map(_scan_chunk, chunks))
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Parallel transpile failed ({e}), transpiling in-process")
+            self.close()
+            return None
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                executor.shutdown(wait=False)
+
+_parallel = None
+
+def transpile_parallel(source: str) -> Optional[str]:
+    global _parallel
+    if _parallel is None:
+        _parallel = ParallelTranspiler()
+    return _parallel.transpile(source)
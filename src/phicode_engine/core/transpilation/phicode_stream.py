@@ -0,0 +1,72 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+from typing import Callable, Iterable, Iterator, Optional
+from .phicode_to_python import _transpiler
+from .symbol_scanner import iter_top_level_lines, iter_code_lines
+from ...config.config import STREAM_CHUNK_SIZE
+
+def _last_cut(pending: str) -> int:
+    cut = 0
+    for cut in iter_top_level_lines(pending, final=False):
+        pass
+    if cut == 0:
+        for cut in iter_code_lines(pending, final=False):
+            pass
+    return cut
+
+def _iter_scanned(chunks: Iterable[str]) -> Iterator[str]:
+    pending = ''
+    retry_at = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        if len(pending) < retry_at:
+            continue
+        out, consumed = _transpiler.scan_partial(pending)
+        if consumed:
+            yield out
+            pending = pending[consumed:]
+            retry_at = 0
+        else:
+            retry_at = 2 * len(pending)
+    if pending:
+        yield _transpiler.scan(pending)
+
+def iter_transpile(chunks: Iterable[str], transpile: Optional[Callable[[str], str]] = None) -> Iterator[str]:
+    if transpile is None:
+        yield from _iter_scanned(chunks)
+        return
+    pending = ''
+    retry_at = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        if len(pending) < retry_at:
+            continue
+        cut = _last_cut(pending)
+        if cut:
+            yield transpile(pending[:cut])
+            pending = pending[cut:]
+            retry_at = 0
+        else:
+            retry_at = 2 * len(pending)
+    if pending:
+        yield transpile(pending)
+
+def iter_reader(reader, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def transpile_stream(reader, writer, chunk_size: int = STREAM_CHUNK_SIZE,
+                     transpile: Optional[Callable[[str], str]] = None) -> int:
+    written = 0
+    for piece in iter_transpile(iter_reader(reader, chunk_size), transpile):
+        writer.write(piece)
+        written += len(piece)
+    return written
@@ -1,9 +1,12 @@
 # Copyright 2025 Baleine Jay
 # Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
 # Commercial use requires a paid license. See link for details.
+import hashlib
 from functools import lru_cache
-from typing import Dict
-from ...config.config import PYTHON_TO_PHICODE, RUST_SIZE_THRESHOLD
+from typing import Dict, Optional, Tuple
+from .symbol_scanner import SymbolScanner, TranslateScanner
+from ...config.config import (PYTHON_TO_PHICODE, PHICODE_VERSION, TRANSLATE_SYMBOL_DENSITY, TRANSLATE_SAMPLE_SIZE,
+                              TRANSPILE_WORKERS, RUST_WORKER_ENABLED)
 
 try:
     import regex as re
@@ -12,7 +15,7 @@ except ImportError:
 
 try:
     from .symbol_config import load_custom_symbols, has_custom_ascii_identifiers, get_ascii_detection_pattern
-    from .symbol_optimization import get_optimized_symbol_order
+    from .symbol_optimization import get_optimized_symbol_order, build_symbol_trie, trie_to_pattern
     _HAS_MODULES = True
 except ImportError:
     _HAS_MODULES = False
@@ -20,6 +23,8 @@ except ImportError:
     has_custom_ascii_identifiers = None
     get_ascii_detection_pattern = None
     get_optimized_symbol_order = None
+    build_symbol_trie = None
+    trie_to_pattern = None
 
 _STRING_PATTERN = re.compile(
     r'('
@@ -33,9 +38,9 @@ _STRING_PATTERN = re.compile(
 )
 
 PHICODE_TO_PYTHON = {v: k for k, v in PYTHON_TO_PHICODE.items()}
+_symbol_table = None
 
-@lru_cache(maxsize=1)
-def get_symbol_mappings() -> Dict[str, str]:
+def _resolve_symbol_mappings() -> Dict[str, str]:
     if _HAS_MODULES and load_custom_symbols:
         custom_symbols = load_custom_symbols()
         base_mapping = PHICODE_TO_PYTHON.copy()
@@ -47,6 +52,40 @@ def get_symbol_mappings() -> Dict[str, str]:
         return base_mapping
     return PHICODE_TO_PYTHON
 
+def _symbol_fingerprint(mappings: Dict[str, str]) -> str:
+    payload = '\0'.join([PHICODE_VERSION] + [f"{symbol}={keyword}" for symbol, keyword in sorted(mappings.items())])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def _build_symbol_table() -> dict:
+    mappings = _resolve_symbol_mappings()
+    ascii_pattern = get_ascii_detection_pattern() if _HAS_MODULES and get_ascii_detection_pattern else None
+    return {
+        'mappings': mappings,
+        'fingerprint': _symbol_fingerprint(mappings),
+        'trie': _trie_pattern_source(mappings),
+        'table': _translation_table(mappings),
+        'ascii': ascii_pattern.pattern if ascii_pattern else None,
+    }
+
+def get_symbol_table() -> dict:
+    global _symbol_table
+    if _symbol_table is None:
+        _symbol_table = _build_symbol_table()
+    return _symbol_table
+
+def install_symbol_table(table: dict) -> bool:
+    global _symbol_table
+    if _symbol_table is not None:
+        return False
+    _symbol_table = table
+    return True
+
+def get_symbol_mappings() -> Dict[str, str]:
+    return get_symbol_table()['mappings']
+
+def get_symbol_fingerprint() -> str:
+    return get_symbol_table()['fingerprint']
+
 @lru_cache(maxsize=1)
 def build_transpilation_pattern() -> re.Pattern:
     mappings = get_symbol_mappings()
@@ -68,27 +107,66 @@ def build_transpilation_pattern() -> re.Pattern:
 
     return re.compile('|'.join(escaped_symbols))
 
+def _is_word_symbol(symbol: str) -> bool:
+    return symbol.isidentifier() and symbol.isascii()
+
+def _trie_pattern_source(mappings: Dict[str, str]) -> str:
+    if not _HAS_MODULES or not trie_to_pattern:
+        return '|'.join(re.escape(sym) for sym in sorted(mappings, key=len, reverse=True))
+
+    words = [sym for sym in mappings if _is_word_symbol(sym)]
+    others = [sym for sym in mappings if not _is_word_symbol(sym)]
+
+    alternatives = []
+    if words:
+        alternatives.append(rf"\b{trie_to_pattern(build_symbol_trie(words))}\b")
+    if others:
+        alternatives.append(trie_to_pattern(build_symbol_trie(others)))
+    return '|'.join(alternatives)
+
+@lru_cache(maxsize=1)
+def build_trie_pattern() -> re.Pattern:
+    return re.compile(get_symbol_table()['trie'])
+
+def _translation_table(mappings: Dict[str, str]) -> Optional[Dict[int, str]]:
+    if any(len(sym) != 1 or _is_word_symbol(sym) for sym in mappings):
+        return None
+    return {ord(sym): keyword for sym, keyword in mappings.items()}
+
+@lru_cache(maxsize=1)
+def build_translation_table() -> Optional[object]:
+    entries = get_symbol_table()['table']
+    if entries is None:
+        return None
+
+    highest = max(entries)
+    if highest > 0xFFFF:
+        return entries
+    table = list(range(highest + 1))
+    for code, keyword in entries.items():
+        table[code] = keyword
+    return tuple(table)
+
+def _symbol_density(source: str) -> float:
+    sample = source[:TRANSLATE_SAMPLE_SIZE]
+    return (len(sample.encode('utf-8', 'surrogatepass')) - len(sample)) / len(sample)
+
 class SymbolTranspiler:
     def __init__(self):
         self._mappings = None
         self._pattern = None
+        self._scanners = None
+        self._rust_threshold = None
+        self._parallel_threshold = None
         self._ascii_detection_pattern = None
 
     def _has_phi_symbols(self, source: str) -> bool:
-        try:
-            view = memoryview(source.encode('utf-8'))
-            for byte in view:
-                if byte > 127:
-                    return True
-        except (UnicodeEncodeError, MemoryError):
-            if any(ord(c) > 127 for c in source):
-                return True
+        if not source.isascii():
+            return True
 
         if self._ascii_detection_pattern is None:
-            if _HAS_MODULES and get_ascii_detection_pattern:
-                self._ascii_detection_pattern = get_ascii_detection_pattern()
-            else:
-                self._ascii_detection_pattern = None
+            ascii_pattern = get_symbol_table()['ascii']
+            self._ascii_detection_pattern = re.compile(ascii_pattern) if ascii_pattern else False
 
         if self._ascii_detection_pattern and self._ascii_detection_pattern.search(source):
             return True
@@ -104,13 +182,55 @@ class SymbolTranspiler:
         if not self._has_phi_symbols(source):
             return source
 
-        if len(source) >= RUST_SIZE_THRESHOLD:
+        if len(source) >= self.rust_threshold():
             from ...rust.phirust_accelerator import try_rust_acceleration
             bypass_security = _should_bypass_security()
             rust_result = try_rust_acceleration(source, self.get_mappings(), bypass_security)
             if rust_result is not None:
                 return rust_result
 
+        if TRANSPILE_WORKERS and len(source) >= self.parallel_threshold():
+            from .phicode_parallel import transpile_parallel
+            parallel_result = transpile_parallel(source)
+            if parallel_result is not None:
+                return parallel_result
+
+        return self.scan(source)
+
+    def rust_threshold(self) -> int:
+        if self._rust_threshold is None:
+            from ...rust.phirust_calibrate import rust_thresholds
+            spawn, worker = rust_thresholds()
+            self._rust_threshold = min(spawn, worker) if RUST_WORKER_ENABLED else spawn
+        return self._rust_threshold
+
+    def parallel_threshold(self) -> int:
+        if self._parallel_threshold is None:
+            from ...rust.phirust_calibrate import parallel_threshold
+            self._parallel_threshold = parallel_threshold()
+        return self._parallel_threshold
+
+    def scan(self, source: str) -> str:
+        return self._get_scanners()[self.engine_for(source)].scan(source)
+
+    def scan_partial(self, source: str) -> Tuple[str, int]:
+        return self._get_scanners()[self.engine_for(source)].scan_partial(source)
+
+    def _get_scanners(self) -> Dict[str, SymbolScanner]:
+        if self._scanners is None:
+            scanners = {'trie': SymbolScanner(self.get_mappings(), build_trie_pattern())}
+            table = build_translation_table()
+            if table is not None:
+                scanners['translate'] = TranslateScanner(table)
+            self._scanners = scanners
+        return self._scanners
+
+    def engine_for(self, source: str) -> str:
+        if 'translate' in self._get_scanners() and source and _symbol_density(source) >= TRANSLATE_SYMBOL_DENSITY:
+            return 'translate'
+        return 'trie'
+
+    def transpile_regex(self, source: str) -> str:
         if self._pattern is None:
             self._pattern = build_transpilation_pattern()
 
@@ -0,0 +1,39 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+from functools import lru_cache
+from typing import List, Tuple
+from .symbol_optimization import build_symbol_trie, trie_to_pattern
+from .symbol_scanner import SymbolScanner
+from ...config.config import PYTHON_TO_PHICODE
+
+try:
+    import regex as re
+except ImportError:
+    import re
+
+@lru_cache(maxsize=1)
+def build_reverse_pattern() -> re.Pattern:
+    return re.compile(rf"\b{trie_to_pattern(build_symbol_trie(PYTHON_TO_PHICODE))}\b")
+
+class ReverseScanner(SymbolScanner):
+    __slots__ = ('used',)
+
+    def __init__(self):
+        super().__init__(PYTHON_TO_PHICODE, build_reverse_pattern())
+        self.used = set()
+
+    def _emit_code(self, source: str, start: int, end: int, emit):
+        parts = self._split(source[start:end])
+        if len(parts) > 1:
+            keywords = parts[1::2]
+            self.used.update(keywords)
+            parts[1::2] = map(self._lookup, keywords)
+            emit(''.join(parts))
+        else:
+            emit(parts[0])
+
+def python_to_phicode(source: str) -> Tuple[str, List[str]]:
+    scanner = ReverseScanner()
+    converted = scanner.scan(source)
+    return converted, [symbol for keyword, symbol in PYTHON_TO_PHICODE.items() if keyword in scanner.used]
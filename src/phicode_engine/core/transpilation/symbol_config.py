@@ -53,8 +53,14 @@ def _log_conflicts_once(conflicts: list):
         logger.warning(f"Symbol conflicts ignored: {conflict_msg}")
         _log_conflicts_once._logged.add(conflict_hash)
 
+def engine_config_path() -> str:
+    for config_path in (CUSTOM_FOLDER_PATH, CUSTOM_FOLDER_PATH_2):
+        if os.path.exists(config_path):
+            return config_path
+    return CUSTOM_FOLDER_PATH
+
 @lru_cache(maxsize=1)
-def load_custom_symbols() -> Dict[str, str]:
+def load_engine_config() -> Dict:
     config_paths = [CUSTOM_FOLDER_PATH, CUSTOM_FOLDER_PATH_2]
 
     for config_path in config_paths:
@@ -62,15 +68,24 @@ def load_custom_symbols() -> Dict[str, str]:
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
                     config = json.load(f)
-                raw_symbols = config.get('symbols', {})
-                return _validate_custom_symbols(raw_symbols)
+                if isinstance(config, dict):
+                    return config
+                logger.warning(f"Expected a JSON object in {config_path}")
             except json.JSONDecodeError as e:
                 logger.warning(f"Invalid JSON in {config_path}: {e}")
             except Exception as e:
-                logger.warning(f"Failed to load symbols from {config_path}: {e}")
+                logger.warning(f"Failed to load {config_path}: {e}")
 
     return {}
 
+@lru_cache(maxsize=1)
+def load_custom_symbols() -> Dict[str, str]:
+    try:
+        return _validate_custom_symbols(load_engine_config().get('symbols', {}))
+    except Exception as e:
+        logger.warning(f"Failed to load symbols from {engine_config_path()}: {e}")
+        return {}
+
 @lru_cache(maxsize=1)
 def has_custom_ascii_identifiers() -> bool:
     custom_symbols = load_custom_symbols()
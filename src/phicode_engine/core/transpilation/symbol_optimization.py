@@ -1,7 +1,12 @@
 # Copyright 2025 Baleine Jay
 # Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
 # Commercial use requires a paid license. See link for details.
-from typing import Dict, List
+from typing import Dict, Iterable, List
+
+try:
+    import regex as re
+except ImportError:
+    import re
 
 _COMMON_SYMBOL_ORDER = ['∀', '∈', 'λ', '→', '≡', 'π', '∧', '∨', '¬', 'ƒ', '⟲', '∴']
 
@@ -30,4 +35,31 @@ def get_adaptive_symbol_order(source: str, mappings: Dict[str, str]) -> List[str
         return get_optimized_symbol_order(mappings)
 
     symbols = list(mappings.keys())
-    return sorted(symbols, key=lambda s: (frequency.get(s, 0), len(s)), reverse=True)
\ No newline at end of file
+    return sorted(symbols, key=lambda s: (frequency.get(s, 0), len(s)), reverse=True)
+
+def build_symbol_trie(symbols: Iterable[str]) -> dict:
+    root = {}
+    for symbol in symbols:
+        node = root
+        for char in symbol:
+            node = node.setdefault(char, {})
+        node[''] = symbol
+    return root
+
+def trie_to_pattern(node: dict) -> str:
+    branches = []
+    chars = []
+    for char in sorted(key for key in node if key):
+        tail = trie_to_pattern(node[char])
+        if tail:
+            branches.append(re.escape(char) + tail)
+        else:
+            chars.append(re.escape(char))
+    if chars:
+        branches.append(chars[0] if len(chars) == 1 else f"[{''.join(chars)}]")
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if '' in node:
+        return f"(?:{pattern})?"
+    return pattern
@@ -0,0 +1,312 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import regex as re
+except ImportError:
+    import re
+
+_CODE_EVENTS = re.compile(r'[\'"#]')
+_FIELD_EVENTS = re.compile(r'[\'"#{}()\[\]:!]')
+_SPEC_EVENTS = re.compile(r'[{}]')
+_PREFIX_CHARS = frozenset('rRbBuUfF')
+_OPEN_BRACKETS = frozenset('([{')
+
+_STRING_END = {
+    '"': re.compile(r'[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"'),
+    "'": re.compile(r"[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'"),
+    '"""': re.compile(r'[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*"""'),
+    "'''": re.compile(r"[^'\\]*(?:(?:\\[\s\S]|'(?!''))[^'\\]*)*'''"),
+}
+
+_FSTRING_EVENTS = {
+    (quote, raw): re.compile((r'\\[^{]|' if raw else r'\\N\{[^}]*\}|\\[^{]|') + r'\{\{?|' + re.escape(quote) +
+                             (r'|\n' if len(quote) == 1 else ''))
+    for quote in _STRING_END for raw in (False, True)
+}
+
+class SymbolScanner:
+    __slots__ = ('_split', '_lookup')
+
+    def __init__(self, mappings: Dict[str, str], pattern: re.Pattern):
+        self._split = re.compile(f"({pattern.pattern})").split
+        self._lookup = mappings.__getitem__
+
+    def scan(self, source: str) -> str:
+        out: List[str] = []
+        emit = out.append
+        start = pos = 0
+        search = _CODE_EVENTS.search
+        while True:
+            m = search(source, pos)
+            if m is None:
+                break
+            i = m.start()
+            if source[i] == '#':
+                end = source.find('\n', i)
+                if end < 0:
+                    end = len(source)
+                if start < i:
+                    self._emit_code(source, start, i, emit)
+                emit(source[i:end])
+                start = pos = end
+                continue
+            prefix_start = self._prefix_start(source, start, i)
+            mark = len(out)
+            if start < prefix_start:
+                self._emit_code(source, start, prefix_start, emit)
+            end = self._scan_string(source, prefix_start, i, out)
+            if end is None:
+                del out[mark:]
+                pos = i + 1
+                continue
+            start = pos = end
+        if start < len(source):
+            self._emit_code(source, start, len(source), emit)
+        return ''.join(out)
+
+    def scan_partial(self, source: str) -> Tuple[str, int]:
+        out: List[str] = []
+        emit = out.append
+        cut = None
+
+        def code(start: int, end: int):
+            nonlocal cut
+            line = source.rfind('\n', start, end)
+            if line >= 0:
+                cut = (len(out), start, line + 1)
+            self._emit_code(source, start, end, emit)
+
+        start = pos = 0
+        search = _CODE_EVENTS.search
+        while True:
+            m = search(source, pos)
+            if m is None:
+                break
+            i = m.start()
+            if source[i] == '#':
+                end = source.find('\n', i)
+                if start < i:
+                    code(start, i)
+                if end < 0:
+                    start = len(source)
+                    break
+                emit(source[i:end])
+                start = pos = end
+                continue
+            prefix_start = self._prefix_start(source, start, i)
+            mark = len(out)
+            if start < prefix_start:
+                code(start, prefix_start)
+            end = self._scan_string(source, prefix_start, i, out)
+            if end is None:
+                if (source.startswith(source[i] * 3, i) or 'f' in source[prefix_start:i].lower() or
+                        source.find('\n', i) < 0):
+                    start = len(source)
+                    break
+                del out[mark:]
+                pos = i + 1
+                continue
+            start = pos = end
+        if start < len(source):
+            code(start, len(source))
+        if cut is None:
+            return '', 0
+        mark, start, stop = cut
+        del out[mark:]
+        if start < stop:
+            self._emit_code(source, start, stop, emit)
+        return ''.join(out), stop
+
+    def _emit_code(self, source: str, start: int, end: int, emit):
+        parts = self._split(source[start:end])
+        if len(parts) > 1:
+            parts[1::2] = map(self._lookup, parts[1::2])
+            emit(''.join(parts))
+        else:
+            emit(parts[0])
+
+    @staticmethod
+    def _prefix_start(source: str, lower: int, quote_at: int) -> int:
+        j = quote_at
+        while j > lower and quote_at - j < 2 and source[j - 1] in _PREFIX_CHARS:
+            j -= 1
+        if j < quote_at and j > 0 and (source[j - 1].isalnum() or source[j - 1] == '_'):
+            return quote_at
+        return j
+
+    def _scan_string(self, source: str, prefix_start: int, quote_at: int, out: List[str]) -> Optional[int]:
+        quote = source[quote_at] * 3 if source.startswith(source[quote_at] * 3, quote_at) else source[quote_at]
+        body = quote_at + len(quote)
+        prefix = source[prefix_start:quote_at]
+        if 'f' not in prefix and 'F' not in prefix:
+            m = _STRING_END[quote].match(source, body)
+            if m is None:
+                return None
+            out.append(source[prefix_start:m.end()])
+            return m.end()
+
+        events = _FSTRING_EVENTS[quote, 'r' in prefix or 'R' in prefix]
+        literal = prefix_start
+        pos = body
+        while True:
+            m = events.search(source, pos)
+            if m is None:
+                return None
+            token = m.group()
+            pos = m.end()
+            if token == '{':
+                out.append(source[literal:pos])
+                pos = self._scan_field(source, pos, out)
+                if pos is None:
+                    return None
+                literal = pos
+            elif token == quote:
+                out.append(source[literal:pos])
+                return pos
+            elif token == '\n':
+                return None
+
+    def _scan_field(self, source: str, pos: int, out: List[str]) -> Optional[int]:
+        emit = out.append
+        start = pos
+        depth = 0
+        search = _FIELD_EVENTS.search
+        while True:
+            m = search(source, pos)
+            if m is None:
+                return None
+            i = m.start()
+            c = source[i]
+            pos = i + 1
+            if c in _OPEN_BRACKETS:
+                depth += 1
+            elif c == ')' or c == ']':
+                depth -= 1
+            elif c == '}':
+                if depth:
+                    depth -= 1
+                    continue
+                if start < i:
+                    self._emit_code(source, start, i, emit)
+                emit('}')
+                return pos
+            elif c == '#':
+                end = source.find('\n', i)
+                if end < 0:
+                    return None
+                if start < i:
+                    self._emit_code(source, start, i, emit)
+                emit(source[i:end])
+                start = pos = end
+            elif c == '"' or c == "'":
+                prefix_start = self._prefix_start(source, start, i)
+                if start < prefix_start:
+                    self._emit_code(source, start, prefix_start, emit)
+                pos = self._scan_string(source, prefix_start, i, out)
+                if pos is None:
+                    return None
+                start = pos
+            elif depth:
+                continue
+            elif c == '!' and not source.startswith('=', pos):
+                if start < i:
+                    self._emit_code(source, start, i, emit)
+                return self._scan_conversion(source, i, out)
+            elif c == ':':
+                if start < i:
+                    self._emit_code(source, start, i, emit)
+                return self._scan_format_spec(source, i, out)
+
+    def _scan_conversion(self, source: str, pos: int, out: List[str]) -> Optional[int]:
+        m = _SPEC_EVENTS.search(source, pos)
+        colon = source.find(':', pos, m.start() if m is not None else len(source))
+        if colon >= 0:
+            out.append(source[pos:colon])
+            return self._scan_format_spec(source, colon, out)
+        if m is None or m.group() != '}':
+            return None
+        out.append(source[pos:m.end()])
+        return m.end()
+
+    def _scan_format_spec(self, source: str, pos: int, out: List[str]) -> Optional[int]:
+        literal = pos
+        while True:
+            m = _SPEC_EVENTS.search(source, pos)
+            if m is None:
+                return None
+            pos = m.end()
+            out.append(source[literal:pos])
+            if m.group() == '}':
+                return pos
+            pos = self._scan_field(source, pos, out)
+            if pos is None:
+                return None
+            literal = pos
+
+class TranslateScanner(SymbolScanner):
+    __slots__ = ('_table',)
+
+    def __init__(self, table):
+        self._table = table
+
+    def _emit_code(self, source: str, start: int, end: int, emit):
+        emit(source[start:end].translate(self._table))
+
+class _StringSkipper(SymbolScanner):
+    __slots__ = ()
+
+    def __init__(self):
+        pass
+
+    def _emit_code(self, source: str, start: int, end: int, emit):
+        pass
+
+_skipper = _StringSkipper()
+
+def _opening(quote: str) -> str:
+    return re.escape(quote) if len(quote) == 3 else rf"{re.escape(quote)}(?!{re.escape(quote * 2)})"
+
+def _simple_fstring(quote: str) -> str:
+    q = re.escape(quote[0])
+    body = rf'[^{q}\\{{}}\n]' if len(quote) == 1 else rf'[^{q}\\{{}}]|{q}(?!{q}{q})'
+    return rf"{_opening(quote)}(?:{body}|\\[^{{]|\{{\{{|\}}\}}|\{{[^{{}}'\"\\#]*\}})*{re.escape(quote)}"
+
+_QUOTES = ('"""', "'''", '"', "'")
+_STRINGS = (r"(?<![fF])(?<![fF][rR])(?:" +
+            '|'.join(_opening(quote) + _STRING_END[quote].pattern for quote in _QUOTES) +
+            r")|(?<=[fF])(?:" + '|'.join(map(_simple_fstring, _QUOTES)) + r")")
+_TOP_LEVEL_REGION = re.compile(rf"(?:[^'\"#\n]+|\n(?!\S)|#[^\n]*|{_STRINGS})*")
+_LINE_REGION = re.compile(rf"(?:[^'\"#\n]+|#[^\n]*|{_STRINGS})*")
+
+def _iter_lines(source: str, region, final: bool, start: int = 0,
+                broken: Optional[List[int]] = None) -> Iterator[int]:
+    code_start = pos = start
+    end = len(source)
+    while True:
+        pos = region(source, pos).end()
+        if pos >= end:
+            return
+        if source[pos] == '\n':
+            pos += 1
+            code_start = pos
+            yield pos
+            continue
+        stop = _skipper._scan_string(source, SymbolScanner._prefix_start(source, code_start, pos), pos, [])
+        if stop is None:
+            if not final:
+                return
+            if broken is not None:
+                broken.append(pos)
+            pos += 1
+        else:
+            code_start = pos = stop
+
+def iter_top_level_lines(source: str, final: bool = True, start: int = 0,
+                         broken: Optional[List[int]] = None) -> Iterator[int]:
+    return _iter_lines(source, _TOP_LEVEL_REGION.match, final, start, broken)
+
+def iter_code_lines(source: str, final: bool = True) -> Iterator[int]:
+    return _iter_lines(source, _LINE_REGION.match, final)
@@ -4,21 +4,68 @@
 import os
 import subprocess
 import json
-from typing import Optional, Dict
+import threading
+from typing import Dict, List, Optional
 from ..core.phicode_logger import logger
-from ..config.config import RUST_NAME, SCRIPT
+from .phirust_calibrate import rust_thresholds
+from .phirust_worker import RustWorker
+from ..config.config import RUST_NAME, SCRIPT, RUST_SIZE_THRESHOLD, RUST_WORKER_ENABLED
 
 _rust_binary_path = None
 _json_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
 _cached_symbols_json = None
 _cached_mappings_hash = None
+_workers: Dict[bool, RustWorker] = {}
+_workers_lock = threading.Lock()
 
 def try_rust_acceleration(source: str, mappings: Dict[str, str], bypass_security: bool = False) -> Optional[str]:
+    return try_rust_acceleration_batch([source], mappings, bypass_security)[0]
+
+def try_rust_acceleration_batch(sources: List[str], mappings: Dict[str, str],
+                                bypass_security: bool = False) -> List[Optional[str]]:
     try:
-        return _try_rust_transpile(source, mappings, bypass_security)
+        worker = _get_worker(mappings, bypass_security)
+        if worker is not None:
+            replies = worker.transpile_batch(sources)
+            if replies is not None or not worker.disabled:
+                return replies or [None] * len(sources)
+        spawn_threshold = rust_thresholds()[0]
+        return [_try_rust_transpile(source, mappings, bypass_security) if len(source) >= spawn_threshold
+                else None for source in sources]
     except Exception as e:
         logger.debug(f"{RUST_NAME} acceleration failed: {e}")
+        return [None] * len(sources)
+
+def _get_worker(mappings: Dict[str, str], bypass_security: bool) -> Optional[RustWorker]:
+    if not RUST_WORKER_ENABLED or not _find_binary():
         return None
+    with _workers_lock:
+        symbols_json = _get_cached_symbols_json(mappings)
+        worker = _workers.get(bypass_security)
+        if worker is None or worker.symbols_json != symbols_json:
+            if worker is not None:
+                worker.close()
+            worker = _workers[bypass_security] = RustWorker(_rust_binary_path, symbols_json, bypass_security)
+    return None if worker.disabled else worker
+
+def close_workers():
+    with _workers_lock:
+        for worker in _workers.values():
+            worker.close()
+        _workers.clear()
+
+def transpile_rust_stream(reader, writer, mappings: Dict[str, str], bypass_security: bool = False,
+                          chunk_size: int = RUST_SIZE_THRESHOLD) -> int:
+    from ..core.transpilation.phicode_stream import transpile_stream
+    from ..core.transpilation.phicode_to_python import _transpiler
+
+    def transpile(source: str) -> str:
+        if not _transpiler._has_phi_symbols(source):
+            return source
+        result = try_rust_acceleration(source, mappings, bypass_security)
+        return _transpiler.scan(source) if result is None else result
+
+    return transpile_stream(reader, writer, chunk_size, transpile)
 
 def _get_cached_symbols_json(mappings: Dict[str, str]) -> str:
     global _cached_symbols_json, _cached_mappings_hash
@@ -31,7 +78,7 @@ def _get_cached_symbols_json(mappings: Dict[str, str]) -> str:
 
     return _cached_symbols_json
 
-def _try_rust_transpile(source: str, mappings: Dict[str, str], bypass_security: bool) -> Optional[str]:
+def _find_binary() -> Optional[str]:
     global _rust_binary_path
 
     if _rust_binary_path is None:
@@ -43,8 +90,10 @@ def _try_rust_transpile(source: str, mappings: Dict[str, str], bypass_security:
         else:
             _rust_binary_path = False
             logger.debug(f"{RUST_NAME} Accelerator not found, using Python fallback")
+    return _rust_binary_path or None
 
-    if not _rust_binary_path:
+def _try_rust_transpile(source: str, mappings: Dict[str, str], bypass_security: bool) -> Optional[str]:
+    if not _find_binary():
         return None
 
     try:
@@ -64,7 +113,7 @@ def _try_rust_transpile(source: str, mappings: Dict[str, str], bypass_security:
 
         if result.returncode == 0:
             logger.debug(f"{RUST_NAME} transpilation successful")
-            return result.stdout.rstrip('\n\r')
+            return result.stdout.rstrip('\n\r') + source[len(source.rstrip('\n\r')):]
         else:
             logger.debug(f"{RUST_NAME} transpilation failed: {result.stderr}")
             return None
@@ -0,0 +1,184 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import importlib.util
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from ..core.phicode_logger import logger
+from ..config.config import (RUST_NAME, RUST_SIZE_THRESHOLD, RUST_WORKER_THRESHOLD, CALIBRATION_SIZES,
+                             CALIBRATION_REPEATS, TRANSPILE_WORKERS, PARALLEL_TRANSPILE_THRESHOLD)
+
+_THRESHOLD_KEYS = {'spawn': 'rust_size_threshold', 'worker': 'rust_worker_threshold', 'pool': 'parallel_threshold'}
+
+_BLOCK = '''ƒ handler_{i}(data, limit={i}):
+    """Generated handler {i}"""
+    result = []
+    ∀ item ∈ data:
+        ¿ item ≡ Ø ∨ ¬ item:
+            ⇉
+        result.append(f"{{item!r}} {{ℓ(item) ∧ ✓}}")  # keep order
+    ⟲ result[:limit]
+'''
+
+def rust_thresholds() -> Tuple[int, int]:
+    from ..core.transpilation.symbol_config import load_engine_config
+    config = load_engine_config()
+    return (_threshold(config, 'rust_size_threshold', RUST_SIZE_THRESHOLD),
+            _threshold(config, 'rust_worker_threshold', RUST_WORKER_THRESHOLD))
+
+def parallel_threshold() -> int:
+    from ..core.transpilation.symbol_config import load_engine_config
+    return _threshold(load_engine_config(), 'parallel_threshold', PARALLEL_TRANSPILE_THRESHOLD)
+
+def _threshold(config: Dict, key: str, default: int) -> int:
+    if key not in config:
+        return default
+    value = config[key]
+    if value is None:
+        return sys.maxsize
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid {key}: {value!r}")
+        return default
+
+def synthetic_source(size: int) -> str:
+    blocks = []
+    total = i = 0
+    while total < size:
+        block = _BLOCK.format(i=i)
+        blocks.append(block)
+        total += len(block)
+        i += 1
+    return ''.join(blocks)[:size]
+
+def _best_time(fn: Callable[[str], Optional[str]], source: str) -> Optional[float]:
+    best = None
+    for _ in range(CALIBRATION_REPEATS):
+        start = time.perf_counter()
+        if fn(source) is None:
+            return None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def fit_crossover(samples: List[Tuple[int, float, float]]) -> Optional[int]:
+    ratios = [(size, rust / python) for size, python, rust in samples if python > 0 and rust > 0]
+    if not ratios or ratios[-1][1] >= 1:
+        return None
+    losing = [index for index, (_, ratio) in enumerate(ratios) if ratio >= 1]
+    if not losing:
+        return ratios[0][0]
+    (low, low_ratio), (high, high_ratio) = ratios[losing[-1]], ratios[losing[-1] + 1]
+    weight = math.log(low_ratio) / (math.log(low_ratio) - math.log(high_ratio))
+    return int(math.exp(math.log(low) + weight * (math.log(high) - math.log(low))))
+
+def _rust_engines(mappings: Dict[str, str], bypass_security: bool) -> Dict[str, Callable[[str], Optional[str]]]:
+    from .phirust_accelerator import _find_binary, _get_worker, _try_rust_transpile
+
+    if not _find_binary():
+        logger.warning(f"{RUST_NAME} Accelerator not installed, skipping its cutover. Install with: phicode --phirust")
+        return {}
+    worker = _get_worker(mappings, bypass_security)
+
+    def via_worker(source: str) -> Optional[str]:
+        replies = worker.transpile_batch([source]) if worker is not None and not worker.disabled else None
+        return replies[0] if replies else None
+
+    engines = {'spawn': lambda source: _try_rust_transpile(source, mappings, bypass_security)}
+    if worker is not None and not worker.disabled:
+        engines['worker'] = via_worker
+    return engines
+
+def calibrate(sizes=CALIBRATION_SIZES) -> Dict:
+    from ..core.transpilation.phicode_to_python import _transpiler, _should_bypass_security
+    from ..core.transpilation.phicode_parallel import ParallelTranspiler
+
+    engines = _rust_engines(_transpiler.get_mappings(), _should_bypass_security())
+    pool = ParallelTranspiler(TRANSPILE_WORKERS or -1)
+    if pool.workers >= 2:
+        engines['pool'] = pool.transpile
+    else:
+        logger.info("⏱️  Single core, the process pool can never win")
+    samples = {mode: [] for mode in engines}
+
+    try:
+        for size in sizes:
+            source = synthetic_source(size)
+            python_time = _best_time(_transpiler.scan, source)
+            line = f"   {size // 1024:>6}KB  Python {python_time * 1000:9.3f}ms"
+            for mode, transpile in engines.items():
+                label = f"pool x{pool.workers}" if mode == 'pool' else f"{RUST_NAME} {mode}"
+                engine_time = _best_time(transpile, source)
+                if engine_time is None:
+                    line += f"  {label} failed"
+                    continue
+                samples[mode].append((size, python_time, engine_time))
+                line += f"  {label} {engine_time * 1000:9.3f}ms"
+            logger.info(line)
+    finally:
+        pool.close()
+
+    result = {
+        "calibrated_at": datetime.now().isoformat(timespec='seconds'),
+        "host": f"{platform.node()} {platform.machine()}",
+        "python": f"{sys.implementation.name} {sys.version_info.major}.{sys.version_info.minor}",
+        "regex": importlib.util.find_spec('regex') is not None,
+        "pool_workers": pool.workers,
+        "samples": {mode: [[size, round(python * 1000, 4), round(rust * 1000, 4)] for size, python, rust in points]
+                    for mode, points in samples.items() if points},
+    }
+    for mode, points in samples.items():
+        if points:
+            result[_THRESHOLD_KEYS[mode]] = fit_crossover(points)
+    if pool.workers < 2:
+        result['parallel_threshold'] = None
+    return result
+
+def save_calibration(result: Dict) -> str:
+    from ..core.transpilation.symbol_config import engine_config_path, load_engine_config
+    path = engine_config_path()
+    config = dict(load_engine_config())
+    config["rust_calibration"] = {key: value for key, value in result.items()
+                                  if key not in _THRESHOLD_KEYS.values()}
+    for key in _THRESHOLD_KEYS.values():
+        if key in result:
+            config[key] = result[key]
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+    load_engine_config.cache_clear()
+    return path
+
+def describe_calibration() -> str:
+    from ..core.transpilation.symbol_config import load_engine_config
+    config = load_engine_config()
+    calibration = config.get("rust_calibration")
+    if not calibration:
+        return (f"not calibrated (defaults {RUST_SIZE_THRESHOLD:,} spawn / {RUST_WORKER_THRESHOLD:,} worker / "
+                f"{PARALLEL_TRANSPILE_THRESHOLD:,} pool chars)")
+    spawn, worker = rust_thresholds()
+    values = {'spawn': spawn, 'worker': worker, 'pool': parallel_threshold()}
+    parts = [f"{mode} {'never' if values[mode] == sys.maxsize else f'{values[mode]:,} chars'}"
+             for mode, key in _THRESHOLD_KEYS.items() if key in config]
+    return f"{', '.join(parts)} (calibrated {calibration.get('calibrated_at', '?')})"
+
+def run_calibration() -> int:
+    logger.info(f"⏱️  Calibrating the {RUST_NAME} and process pool cutovers...")
+    result = calibrate()
+    if not any(key in result for key in _THRESHOLD_KEYS.values()):
+        logger.error("❌ No engine produced usable timings, nothing written")
+        return 1
+    path = save_calibration(result)
+    logger.info(f"✅ Cutover: {describe_calibration()}")
+    logger.info(f"📝 Written to {path}")
+    return 0
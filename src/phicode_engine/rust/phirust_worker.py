@@ -0,0 +1,162 @@
+# Copyright 2025 Baleine Jay
+# Licensed under the Phicode Non-Commercial License (https://banes-lab.com/licensing)
+# Commercial use requires a paid license. See link for details.
+import os
+import struct
+import subprocess
+import threading
+from typing import List, Optional
+from ..core.phicode_logger import logger
+from ..config.config import RUST_NAME, RUST_WORKER_TIMEOUT, RUST_WORKER_PROBE_TIMEOUT, RUST_WORKER_MAX_RESTARTS
+
+_LENGTH = struct.Struct('>I')
+_REPLY = struct.Struct('>BI')
+_unsupported = set()
+
+class RustWorker:
+    def __init__(self, binary_path: str, symbols_json: str, bypass_security: bool = False):
+        self.binary_path = binary_path
+        self.symbols_json = symbols_json
+        self.bypass_security = bypass_security
+        self.disabled = binary_path in _unsupported
+        self._process: Optional[subprocess.Popen] = None
+        self._served = False
+        self._failures = 0
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> subprocess.Popen:
+        cmd = [self.binary_path, "--serve"]
+        if self.bypass_security:
+            cmd.append("--bypass")
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            replies = self._exchange(process, [self.symbols_json], RUST_WORKER_PROBE_TIMEOUT)
+        except (OSError, ValueError):
+            self._discard(process)
+            raise
+        if replies[0] is None:
+            self._discard(process)
+            raise OSError("symbol table rejected")
+        logger.debug(f"{RUST_NAME} worker started (pid {process.pid})")
+        return process
+
+    @staticmethod
+    def _write(process: subprocess.Popen, payloads: List[str]):
+        stream = process.stdin
+        stream.write(_LENGTH.pack(len(payloads)))
+        for payload in payloads:
+            data = payload.encode('utf-8')
+            stream.write(_LENGTH.pack(len(data)))
+            stream.write(data)
+        stream.flush()
+
+    @classmethod
+    def _write_in_background(cls, process: subprocess.Popen, payloads: List[str]):
+        try:
+            cls._write(process, payloads)
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _read_exact(process: subprocess.Popen, size: int) -> bytes:
+        data = process.stdout.read(size)
+        if len(data) != size:
+            raise EOFError(f"{RUST_NAME} worker exited (code {process.poll()})")
+        return data
+
+    def _exchange(self, process: subprocess.Popen, payloads: List[str], timeout: float) -> List[Optional[str]]:
+        expired = threading.Event()
+        timer = threading.Timer(timeout, lambda: (expired.set(), self._kill(process)))
+        timer.start()
+        writer = None
+        try:
+            if len(payloads) > 1:
+                writer = threading.Thread(target=self._write_in_background, args=(process, payloads), daemon=True)
+                writer.start()
+            else:
+                self._write(process, payloads)
+            replies = []
+            for _ in payloads:
+                status, size = _REPLY.unpack(self._read_exact(process, _REPLY.size))
+                body = self._read_exact(process, size).decode('utf-8')
+                if status:
+                    logger.debug(f"{RUST_NAME} worker rejected a source: {body}")
+                    replies.append(None)
+                else:
+                    replies.append(body)
+            if writer is not None:
+                writer.join()
+            return replies
+        except (EOFError, OSError) as e:
+            if expired.is_set():
+                raise TimeoutError(f"no reply within {timeout:g}s") from e
+            raise OSError(str(e)) from e
+        finally:
+            timer.cancel()
+
+    @staticmethod
+    def _kill(process: subprocess.Popen):
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+    def transpile_batch(self, sources: List[str]) -> Optional[List[Optional[str]]]:
+        with self._lock:
+            for _ in range(2):
+                if self.disabled:
+                    return None
+                try:
+                    if self._process is None:
+                        self._process = self._start()
+                        self._served = True
+                    replies = self._exchange(self._process, sources, RUST_WORKER_TIMEOUT * len(sources))
+                    self._failures = 0
+                    return replies
+                except TimeoutError as e:
+                    self._fail(e)
+                    return None
+                except (OSError, ValueError) as e:
+                    self._fail(e)
+            return None
+
+    def _fail(self, error: Exception):
+        self._close_process()
+        self._failures += 1
+        if not self._served:
+            self.disabled = True
+            _unsupported.add(self.binary_path)
+            logger.debug(f"{RUST_NAME} worker unavailable ({error}), spawning per file")
+        elif self._failures > RUST_WORKER_MAX_RESTARTS:
+            self.disabled = True
+            logger.warning(f"{RUST_NAME} worker failed {self._failures} times in a row ({error}), "
+                           f"using Python fallback")
+        elif isinstance(error, TimeoutError):
+            logger.warning(f"{RUST_NAME} worker timeout ({error}), using Python fallback")
+        else:
+            logger.debug(f"{RUST_NAME} worker crashed ({error}), restarting")
+
+    @classmethod
+    def _discard(cls, process: subprocess.Popen):
+        cls._kill(process)
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        process.wait()
+
+    def _close_process(self):
+        process, self._process = self._process, None
+        if process is not None:
+            self._discard(process)
+
+    def close(self):
+        with self._lock:
+            self._close_process()